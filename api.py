@@ -0,0 +1,349 @@
+"""Read-only JSON API over the aggregates the dashboard shows.
+
+Serves the same data as ``app.py`` from the same process-wide cached layer
+(``datastore``), for tools that would otherwise scrape the dashboard:
+
+    python api.py --port 8502
+    curl 'localhost:8502/api/growth?creator=IShowSpeed&granularity=Quarter'
+
+``GET /api`` lists the endpoints and their filter parameters. Every
+response body is built once per (endpoint, query, source table versions) and
+kept with its gzip encoding and ETag. A repeat request is answered from
+memory, or with 304 Not Modified when the client sends a matching
+If-None-Match.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+import datastore
+import warmup
+from creators import CREATORS, input_file, output_file
+
+CACHE_SIZE = 512  # responses kept in memory
+GZIP_LEVEL = 6
+
+
+class BadRequest(ValueError):
+    """A missing or invalid query parameter."""
+
+
+def _one(params, name, default=None, choices=None):
+    value = params.get(name, [default])[-1]
+    if choices is not None and value is not None and value not in choices:
+        raise BadRequest(f"{name} must be one of {list(choices)}")
+    return value
+
+
+def _many(params, name):
+    """Repeated and comma-separated values: ?platform=a&platform=b,c"""
+    return [v for value in params.get(name, []) for v in value.split(",") if v]
+
+
+def _limit(df, params):
+    limit = _one(params, "limit")
+    if limit is None:
+        return df
+    try:
+        return df.head(int(limit))
+    except ValueError:
+        raise BadRequest("limit must be an integer") from None
+
+
+def _date_range(df, column, params):
+    dates = pd.to_datetime(df[column], errors="coerce", utc=True).dt.tz_localize(None)
+    try:
+        start = pd.Timestamp(_one(params, "start", "1900-01-01"))
+        end = pd.Timestamp(_one(params, "end", "2200-01-01"))
+    except ValueError:
+        raise BadRequest("start and end must be dates (YYYY-MM-DD)") from None
+    return df[(dates >= start) & (dates <= end)]
+
+
+def _isin(df, column, values):
+    return df[df[column].isin(values)] if values else df
+
+
+def sentiment_summary(params):
+    df = datastore.sentiment_summary()
+    return _isin(df, "Platform", _many(params, "platform"))
+
+
+def sentiment_over_time(params):
+    df = datastore.sentiment_over_time()
+    df = _isin(df, "platform", _many(params, "platform"))
+    return _date_range(df, "date", params)
+
+
+def twitter_engagement(params):
+    df = datastore.twitter_engagement()
+    return _isin(df, "Creator", _many(params, "creator"))
+
+
+def view_forecast(params):
+    return _date_range(datastore.read_csv("youtube_view_forecast.csv"), "Month", params)
+
+
+def subscriber_forecast(params):
+    return _date_range(datastore.read_csv("subscriber_forecast.csv"), "Date", params)
+
+
+def top_countries(params):
+    df = datastore.read_csv("top_countries.csv")
+    return _limit(df.sort_values("Mentions", ascending=False), params)
+
+
+def collaborations(params):
+    creator = _one(params, "creator", "IShowSpeed", choices=CREATORS)
+    try:
+        limit = int(_one(params, "limit", 10))
+    except ValueError:
+        raise BadRequest("limit must be an integer") from None
+    return datastore.comention_graph().related(creator, limit)
+
+
+def growth_rollup(params):
+    import rollups
+
+    creator = _one(params, "creator", choices=rollups.available_creators())
+    if creator is None:
+        raise BadRequest("creator is required")
+    level = _one(params, "granularity", "Month", choices=rollups.LEVELS)
+    df = datastore.growth_pyramid(creator).level(level)
+    return _date_range(df, level, params)
+
+
+def growth_index(params):
+    import growth
+
+    creators = _many(params, "creator") or list(CREATORS)
+    unknown = set(creators) - set(CREATORS)
+    if unknown:
+        raise BadRequest(f"unknown creator(s): {sorted(unknown)}")
+    metric = _one(params, "metric", "subscribers", choices=growth.METRICS)
+    try:
+        baseline = pd.Timestamp(_one(params, "baseline", growth.DEFAULT_BASELINE))
+    except ValueError:
+        raise BadRequest("baseline must be a date (YYYY-MM-DD)") from None
+    _, last_day = growth.date_range(creators, metric)
+    if baseline > last_day:
+        raise BadRequest(f"baseline must be on or before {last_day.date()}")
+    baseline = str(baseline)
+    df = growth.normalized_index(tuple(creators), baseline, metric).reset_index()
+    return _date_range(df, "Day", params)
+
+
+def search(params):
+    import search as search_module
+
+    query = _one(params, "q")
+    if not query:
+        raise BadRequest("q is required")
+    sentiments = _many(params, "sentiment")
+    if set(sentiments) - set(search_module.SENTIMENTS):
+        raise BadRequest(f"sentiment must be in {search_module.SENTIMENTS}")
+    try:
+        limit = int(_one(params, "limit", 20))
+    except ValueError:
+        raise BadRequest("limit must be an integer") from None
+    return datastore.search_index().search(
+        query,
+        platforms=_many(params, "platform") or None,
+        sentiments=sentiments or None,
+        limit=limit,
+    )
+
+
+def _growth_files():
+    import growth
+
+    files = [input_file(creator, "growth") for creator in CREATORS]
+    return files + growth.source_files()
+
+
+def _corpus_files():
+    import corpus
+
+    return corpus.source_files()
+
+
+def _comention_files():
+    import comentions
+
+    return comentions.input_files()
+
+
+# path -> (handler, filter parameters, files the response depends on)
+ENDPOINTS = {
+    "/api/sentiment/summary": (sentiment_summary, ["platform"], _corpus_files),
+    "/api/sentiment/over-time": (
+        sentiment_over_time,
+        ["platform", "start", "end"],
+        lambda: list(datastore.SENTIMENT_FILES.values()),
+    ),
+    "/api/engagement/twitter": (
+        twitter_engagement,
+        ["creator"],
+        lambda: [output_file(c, "twitter_engagement.csv") for c in CREATORS]
+        + [input_file(c, "tweets") for c in CREATORS],
+    ),
+    "/api/forecast/views": (
+        view_forecast,
+        ["start", "end"],
+        lambda: ["youtube_view_forecast.csv"],
+    ),
+    "/api/forecast/subscribers": (
+        subscriber_forecast,
+        ["start", "end"],
+        lambda: ["subscriber_forecast.csv"],
+    ),
+    "/api/countries": (top_countries, ["limit"], lambda: ["top_countries.csv"]),
+    "/api/collaborations": (
+        collaborations,
+        ["creator", "limit"],
+        _comention_files,
+    ),
+    "/api/growth": (
+        growth_rollup,
+        ["creator", "granularity", "start", "end"],
+        _growth_files,
+    ),
+    "/api/growth/index": (
+        growth_index,
+        ["creator", "metric", "baseline", "start", "end"],
+        _growth_files,
+    ),
+    "/api/search": (
+        search,
+        ["q", "platform", "sentiment", "limit"],
+        _corpus_files,
+    ),
+}
+
+
+class _Response:
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=GZIP_LEVEL)
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+_lock = threading.Lock()
+_responses = OrderedDict()  # (path, query, mtimes) -> _Response
+
+
+def _encode(payload):
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _render(path, params):
+    if path in ("/api", "/api/"):
+        index = {p: {"filters": filters} for p, (_, filters, _) in ENDPOINTS.items()}
+        return _Response(200, _encode({"endpoints": index}))
+    handler = ENDPOINTS[path][0]
+    try:
+        df = handler(params)
+    except BadRequest as e:
+        return _Response(400, _encode({"error": str(e)}))
+    records = df.to_json(orient="records", date_format="iso", force_ascii=False)
+    body = f'{{"count":{len(df)},"data":{records}}}'.encode("utf-8")
+    return _Response(200, body)
+
+
+def get_response(path, query):
+    """The cached response for ``path`` and raw query string ``query``."""
+    if path not in ENDPOINTS and path not in ("/api", "/api/"):
+        return _Response(404, _encode({"error": f"no endpoint {path}"}))
+    params = parse_qs(query)
+    sources = ENDPOINTS[path][2]() if path in ENDPOINTS else []
+    key = (
+        path,
+        tuple(sorted((k, tuple(v)) for k, v in params.items())),
+        tuple(datastore.table_version(source) for source in sources),
+    )
+    with _lock:
+        response = _responses.get(key)
+        if response is not None:
+            _responses.move_to_end(key)
+            return response
+    response = _render(path, params)
+    if response.status == 200:
+        with _lock:
+            _responses[key] = response
+            if len(_responses) > CACHE_SIZE:
+                _responses.popitem(last=False)
+    return response
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "dashboard-api"
+    protocol_version = "HTTP/1.1"  # keep-alive; every response has a length
+    disable_nagle_algorithm = True
+    wbufsize = 1 << 16  # send headers and body in one write
+    quiet = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            datastore.use_snapshot()
+            response = get_response(url.path.rstrip("/") or "/api", url.query)
+        except Exception as e:  # keep serving other requests
+            response = _Response(500, _encode({"error": str(e)}))
+
+        if response.status == 200 and response.etag in self.headers.get(
+            "If-None-Match", ""
+        ):
+            self.send_response(304)
+            self.send_header("ETag", response.etag)
+            self.end_headers()
+            return
+
+        use_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        body = response.gzipped if use_gzip else response.body
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        if response.status == 200:
+            self.send_header("ETag", response.etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    Handler.quiet = not args.verbose
+    warmup.start()
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"Serving on http://{args.host}:{args.port}/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
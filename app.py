@@ -1,25 +1,44 @@
+import time
+
+script_started = time.perf_counter()
+
+# Plotting libraries are imported per section below, so the page header
+# renders before they load on a fresh server process.
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-import plotly.express as px
+
+import charts
+import datastore
+import warmup
 
 st.set_page_config(layout="wide")
 st.title("📊 IShowSpeed: Rise of a Digital Phenomenon")
 
+
+@st.cache_resource
+def start_warm_up():
+    return warmup.start()
+
+
+# The warm-up fills the caches in the background while the page renders; a
+# section that needs a cache the thread is still building waits for that
+# build instead of starting its own
+start_warm_up()
+
+# Every table this run reads comes from one published snapshot
+snapshot = datastore.use_snapshot()
+
 # === Load Data ===
 try:
-    yt_views = pd.read_csv("youtube_view_forecast.csv")
-    sub_forecast = pd.read_csv("subscriber_forecast.csv")
-    country_mentions = pd.read_csv("top_countries.csv")
-    collab_mentions = pd.read_csv("collab_counts.csv")
-    sentiment_over_time = pd.read_csv("sentiment_over_time.csv")
-    content_type_trend = pd.read_csv("content_type_trend.csv")
-    creator_comparison = pd.read_csv("creator_comparison.csv")
-    platform_freq = pd.read_csv("platform_freq.csv")
+    yt_views = datastore.read_csv("youtube_view_forecast.csv")
+    sub_forecast = datastore.read_csv("subscriber_forecast.csv")
+    country_mentions = datastore.read_csv("top_countries.csv")
+    sentiment_over_time = datastore.read_csv("sentiment_over_time.csv")
+    content_type_trend = datastore.read_csv("content_type_trend.csv")
+    creator_comparison = datastore.read_csv("creator_comparison.csv")
+    platform_freq = datastore.read_csv("platform_freq.csv")
 
-    content_trend = pd.read_csv("content_trend.csv")
-    index_comparison = pd.read_csv("normalized_index.csv")
+    content_trend = datastore.read_csv("content_trend.csv")
 
 
 except Exception as e:
@@ -35,6 +54,7 @@ tabs = st.tabs(
         "📈 Future Predictions",
         "🤖 Comparisons With Others",
         "📈 Growth & Demographics",
+        "🔎 Search",
         "🔮 Conclusions",
     ]
 )
@@ -85,6 +105,9 @@ with tabs[0]:
 
 # === Tab 1: Sentiment Analysis ===
 with tabs[1]:
+    import plotly.graph_objects as go
+    import plotly.express as px
+
     st.title("📊 Sentiment Analysis from Instagram, Twitter, Reddit & YouTube")
     st.subheader("📶Sentiment Distribution by Platform")
 
@@ -122,6 +145,13 @@ with tabs[1]:
         )
     )
 
+    with st.expander("🧹 Duplicate-adjusted split (retweets & spam counted once)"):
+        st.dataframe(
+            datastore.sentiment_summary()[
+                ["Platform", "% Positive", "% Neutral", "% Negative", "Total"]
+            ].rename(columns={"Total": "Unique Texts"})
+        )
+
     # Create percentage-based bar chart
     fig = go.Figure()
 
@@ -150,20 +180,20 @@ with tabs[1]:
         height=500,
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    charts.plotly_chart(fig, use_container_width=True)
 
-    emoji_data = {
-        "🔥Instagram": [("🔥", 305), ("😂", 266), ("❤", 196), ("😍", 64), ("👏", 61)],
-        "😭Twitter": [("😭", 185), ("😂", 83), ("📰", 82), ("🔥", 76), ("🔴", 70)],
-        "😭Reddit": [("😭", 19), ("💀", 8), ("💪", 3), ("🔥", 3), ("🙏", 3)],
-        "😂YouTube": [("😂", 991), ("🔥", 624), ("❤", 369), ("😭", 353), ("🤣", 307)],
-    }
+    # Emoji, hashtag and mention counts streamed through fixed-size sketches
+    corpus_sketches = datastore.corpus_sketches()
+    top_emoji = corpus_sketches.heavy_hitters("emoji", 5, creator="IShowSpeed")
 
     st.header("Top Emojis per Platform")
 
-    for platform, emoji_list in emoji_data.items():
-        st.subheader(f"{platform}")
-        df_emoji = pd.DataFrame(emoji_list, columns=["Emoji", "Count"])
+    for platform in ["Instagram", "Twitter", "Reddit", "YouTube"]:
+        df_emoji = top_emoji[top_emoji["platform"] == platform]
+        df_emoji = df_emoji.rename(columns={"Token": "Emoji"})[["Emoji", "Count"]]
+        if df_emoji.empty:
+            continue
+        st.subheader(f"{df_emoji['Emoji'].iloc[0]}{platform}")
         fig = px.bar(
             df_emoji,
             x="Emoji",
@@ -172,31 +202,28 @@ with tabs[1]:
             color="Count",
             color_continuous_scale="Bluered",
         )
-        st.plotly_chart(fig, use_container_width=True)
-
-    # Load each CSV
-    df_insta = pd.read_csv("instagram_sentiment_over_time.csv")
-    df_twitter = pd.read_csv("twitter_sentiment_over_time.csv")
-    df_reddit = pd.read_csv("reddit_sentiment_over_time.csv")
-    df_youtube = pd.read_csv("youtube_sentiment_over_time.csv")
-
-    # Combine
-    df_all = pd.concat([df_insta, df_twitter, df_reddit, df_youtube], ignore_index=True)
-
-    # Standardize platform names
-    df_all["platform"] = (
-        df_all["platform"]
-        .str.strip()
-        .str.lower()
-        .map(
-            {
-                "youtube": "YouTube",
-                "twitter": "Twitter",
-                "instagram": "Instagram",
-                "reddit": "Reddit",
-            }
-        )
-    )
+        charts.plotly_chart(fig, use_container_width=True)
+
+    with st.expander("👥 Unique Commenters, Hashtags & Mentions"):
+        st.caption("Estimated from fixed-size sketches (HyperLogLog, Space-Saving)")
+        authors = corpus_sketches.distinct_authors(by=("creator", "platform"))
+        followers = corpus_sketches.distinct_followers()
+        cols = st.columns(len(authors) + len(followers))
+        for col, row in zip(cols, authors.itertuples(index=False)):
+            col.metric(f"Unique {row.platform} Commenters", f"~{row[2]:,}")
+        for col, row in zip(cols[len(authors) :], followers.itertuples(index=False)):
+            col.metric("Unique Followers Sampled", f"~{row[1]:,}")
+        col1, col2 = st.columns(2)
+        for col, kind in [(col1, "hashtag"), (col2, "mention")]:
+            with col:
+                st.markdown(f"**Top {kind.title()}s**")
+                st.dataframe(
+                    corpus_sketches.heavy_hitters(kind, 5, creator="IShowSpeed"),
+                    hide_index=True,
+                )
+
+    # Combine the per-platform CSVs, with standardized platform names
+    df_all = datastore.sentiment_over_time()
 
     # Convert date
     df_all["date"] = pd.to_datetime(df_all["date"])
@@ -224,18 +251,66 @@ with tabs[1]:
         color_discrete_map={"positive": "green", "negative": "red"},
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    # Mark the largest detected jumps in positive/negative mentions per platform
+    sentiment_events = datastore.sentiment_events()
+    rises = sentiment_events[
+        sentiment_events["Series"].isin(["positive", "negative"])
+        & (sentiment_events["Change"] > 0)
+    ]
+    for date, day_events in list(rises.groupby("Date", sort=False))[:5]:
+        label = ", ".join(
+            f"{e.Platform} {e.Series} +{e.Change:.0f}/day"
+            for e in day_events.itertuples()
+        )
+        fig.add_shape(
+            type="line",
+            x0=date,
+            x1=date,
+            y0=0,
+            y1=1,
+            yref="paper",
+            line=dict(color="gray", dash="dot"),
+        )
+        fig.add_annotation(
+            x=date,
+            y=1,
+            yref="paper",
+            text=label,
+            showarrow=False,
+            textangle=-90,
+            xanchor="right",
+            yanchor="top",
+            font=dict(size=10),
+        )
+
+    charts.plotly_chart(fig, use_container_width=True)
+
+    with st.expander("📅 Detected Sentiment Shifts"):
+        st.caption(
+            "Change points found by PELT in each platform's daily counts; "
+            "Before/After are mean mentions per day."
+        )
+        st.dataframe(sentiment_events, hide_index=True, use_container_width=True)
 
     st.header("Interpretive Insight")
 
-    st.markdown(
-        """
-    - 🔥 **Instagram & YouTube** show consistently positive sentiment and are emoji-rich.
-    - 💬 **Twitter** shows the highest emotional reactivity — both positive and negative — likely due to real-time events.
-    - 💭 **Reddit** has a high neutral percentage, suggesting deeper or more analytical discussions.
-    - 📅 **May 30–31** marks a major sentiment spike across platforms — aligned with the UCL trophy moment.
-    """
-    )
+    insights = [
+        "🔥 **Instagram & YouTube** show consistently positive sentiment and are emoji-rich.",
+        "💬 **Twitter** shows the highest emotional reactivity — both positive and negative — likely due to real-time events.",
+        "💭 **Reddit** has a high neutral percentage, suggesting deeper or more analytical discussions.",
+    ]
+    if not rises.empty:
+        top = rises.iloc[0]
+        platforms = rises.loc[
+            (rises["Date"] - top["Date"]).abs() <= pd.Timedelta(days=1), "Platform"
+        ].unique()
+        insights.append(
+            f"📅 **{top['Date']:%B} {top['Date'].day}** marks the largest detected "
+            f"sentiment shift ({top['Platform']} {top['Series']} mentions: "
+            f"{top['Before']:.0f} → {top['After']:.0f} per day), seen on "
+            f"{' & '.join(platforms)}."
+        )
+    st.markdown("\n".join(f"- {insight}" for insight in insights))
 
     st.header("Summary & Implications")
 
@@ -257,6 +332,8 @@ with tabs[1]:
 
 # === Tab 2: Content Types ===
 with tabs[2]:
+    import plotly.express as px
+
     st.subheader("🧩 Content Format Trends (Instagram + Twitter)")
     content_type_trend["month"] = content_type_trend["month"].astype(str)
     pivot = content_type_trend.pivot_table(
@@ -392,7 +469,7 @@ with tabs[2]:
         y="Avg Likes (Instagram)",
         title="Instagram: Avg Likes by Content Type",
     )
-    st.plotly_chart(fig)
+    charts.plotly_chart(fig)
 
     fig2 = px.scatter(
         df_twitter,
@@ -402,12 +479,81 @@ with tabs[2]:
         color="content_type",
         title="Twitter: Engagement Efficiency (Likes vs Views)",
     )
-    st.plotly_chart(fig2)
+    charts.plotly_chart(fig2)
+
+    # Every tweet of every creator, rather than content-type averages
+    import creators
+
+    every_tweet = pd.concat(
+        [
+            datastore.read_csv(creators.input_file(creator, "tweets")).assign(
+                Creator=creator
+            )
+            for creator in creators.CREATORS
+        ],
+        ignore_index=True,
+    )
+    every_tweet = every_tweet[(every_tweet["Views"] > 0) & (every_tweet["Likes"] > 0)]
+    every_tweet["Tweet"] = every_tweet["Text"].str.slice(0, 80)
+    fig3 = px.scatter(
+        every_tweet,
+        x="Views",
+        y="Likes",
+        color="Creator",
+        log_x=True,
+        log_y=True,
+        opacity=0.6,
+        hover_data={"Tweet": True},
+        title="Twitter: Likes vs Views for Every Tweet",
+    )
+    charts.plotly_chart(fig3)
 
     # Top Performing Content
     st.subheader("Top YouTube Videos by Views")
     st.dataframe(df_youtube_top.sort_values(by="Views", ascending=False).head(5))
 
+    # Drill-down into one video's comments
+    import comment_store
+
+    st.subheader("🎬 Drill into a Video")
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        comments_creator = st.selectbox(
+            "Creator", comment_store.available_creators(), key="comments_creator"
+        )
+    store = datastore.comment_store(comments_creator)
+    videos = store.videos().sort_values("Comments", ascending=False)
+    video_titles = dict(zip(videos["Video ID"], videos["Video Title"]))
+    with col2:
+        video_id = st.selectbox(
+            "Video",
+            list(video_titles),
+            format_func=lambda v: f"{video_titles[v]} ({v})",
+            key="comments_video",
+        )
+
+    video_comments = store.comments(video_id)
+    col1, col2 = st.columns(2)
+    with col1:
+        breakdown = store.sentiment_breakdown(video_id)
+        fig = px.bar(
+            breakdown[breakdown > 0].rename_axis("Sentiment").reset_index(),
+            x="Sentiment",
+            y="Comments",
+            color="Sentiment",
+            title="Comment Sentiment",
+        )
+        charts.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.markdown("**Top Emojis**")
+        st.dataframe(store.top_emoji(video_id), hide_index=True)
+        st.metric("Comment Likes", f"{video_comments['Likes'].sum():,}")
+    st.dataframe(
+        video_comments.sort_values("Likes", ascending=False),
+        use_container_width=True,
+        hide_index=True,
+    )
+
     # Content Frequency & Dominance
     fig = px.pie(
         df_content_counts_instagram,
@@ -415,7 +561,7 @@ with tabs[2]:
         values="count",
         title="Instagram Content Distribution",
     )
-    st.plotly_chart(fig)
+    charts.plotly_chart(fig)
 
     # Engagement Efficiency Overview
     st.subheader("Cross-Platform Content Efficiency")
@@ -509,10 +655,38 @@ with tabs[3]:
             - He remains relevant and influential in the creator ecosystem.
             - His growth opens up more monetization, sponsorship, and brand collaboration opportunities.
 
-        🔮 **Conclusion**: Strong growth trend with no signs of plateauing over the next 12–18 months.
         """
         )
 
+        # How well the same kind of model would have done in the past
+        results = datastore.forecast_backtest()
+        results = results[results["Creator"] == "IShowSpeed"]
+        at_12 = results[results["Horizon"] == 12].set_index(["Metric", "Model"])
+        linear = at_12.loc[("subscribers", "linear")]
+        best = at_12.loc["subscribers"]["MAPE"].idxmin()
+        st.markdown(
+            f"""
+        🔎 **Backtest**: refit month by month on the history available at the time, the
+        linear trend's 12-month subscriber forecast was off by **{linear['MAPE']:.1%}** on
+        average over {int(linear['Folds'])} origins, and its 80% interval held the actual
+        value **{linear['Coverage']:.0%}** of the time. The most accurate model at that
+        horizon was **{best}** ({at_12.loc[('subscribers', best), 'MAPE']:.1%}).
+        Treat the trend as a direction, not a guarantee.
+        """
+        )
+        horizons = results[results["Horizon"].isin([1, 3, 6, 12])]
+        st.dataframe(
+            horizons.pivot_table(
+                index=["Metric", "Model"],
+                columns="Horizon",
+                values="MAPE",
+                sort=False,
+            )
+            .rename(columns=lambda h: f"MAPE {h}m")
+            .style.format("{:.1%}"),
+            use_container_width=True,
+        )
+
     st.subheader("📲 Fan-Mentioned Platforms")
     # Create Altair bar chart
     bar_chart = (
@@ -643,15 +817,22 @@ with tabs[3]:
         "Ronaldo": "#FFCC00",
         "Messi": "#66CCFF",
         "Kai Cenat": "#FF6699",
-        "Ava": "#CC99FF",
-        "Speed with": "#00CCCC",
-        "Twitch": "#9966FF",
+        "Adin Ross": "#CC99FF",
+        "KSI": "#00CCCC",
+        "Eminem": "#9966FF",
         "MrBeast": "#FF9966",
-        "Other": "#CCCCCC",
     }
 
+    # People and handles named in IShowSpeed's corpora, from the co-mention graph
+    comention_graph = datastore.comention_graph()
+    collab_mentions = comention_graph.related("IShowSpeed", 8)
+    collab_mentions = collab_mentions.rename(columns={"Entity": "Collaborator"})
+
     color_scale = alt.Scale(
-        domain=list(collab_colors.keys()), range=list(collab_colors.values())
+        domain=list(collab_mentions["Collaborator"]),
+        range=[
+            collab_colors.get(c, "#CCCCCC") for c in collab_mentions["Collaborator"]
+        ],
     )
 
     # Altair Chart
@@ -668,19 +849,37 @@ with tabs[3]:
             ),
             y=alt.Y("Mentions:Q", title="Mentions"),
             color=alt.Color("Collaborator:N", scale=color_scale, legend=None),
-            tooltip=["Collaborator", "Mentions"],
+            tooltip=["Collaborator", "Mentions", alt.Tooltip("Lift:Q", format=".2f")],
         )
         .properties(title="Top Collaboration Mentions by Fans", width=600, height=400)
     )
 
     st.altair_chart(chart, use_container_width=True)
 
+    with st.expander("🕸️ Who Gets Mentioned Together"):
+        pair_entity = st.selectbox(
+            "Mentioned with", list(collab_mentions["Collaborator"]), key="comention"
+        )
+        if pair_entity is None:
+            st.info("Nobody is named often enough yet to show co-mentions.")
+        else:
+            st.dataframe(
+                comention_graph.co_mentions(pair_entity).round(2),
+                hide_index=True,
+                use_container_width=True,
+            )
+        st.caption(
+            "Counted over YouTube comments, fans' tweets, Instagram posts and"
+            " comments, Reddit posts and the creators' own tweets."
+            " Lift > 1: named together more often than chance; PMI is log2(lift)."
+        )
+
     with st.expander("📌 Collaboration Indicators", expanded=False):
         st.markdown(
             """
-        Analysis of IShowSpeed's recent Instagram and Twitter posts reveals a **strong fan-driven interest in collaborations** — particularly with **Cristiano Ronaldo**, who dominates mentions by a significant margin.  
+        Analysis of what fans write about IShowSpeed on YouTube, Twitter, Instagram and Reddit reveals a **strong fan-driven interest in collaborations** — particularly with **Cristiano Ronaldo**, who dominates mentions by a significant margin.  
         **Lionel Messi** also features notably, indicating **sustained engagement with football-related content**.  
-        The use of the word **"with"** in many posts reinforces the collaborative nature of these mentions.
+        Creators such as **Kai Cenat**, **Adin Ross** and **KSI** are also named regularly, often in the same posts as each other.
 
         This suggests that:
         - 🏆 **Fans are highly engaged** with content involving global sports icons  
@@ -691,6 +890,9 @@ with tabs[3]:
 
 # === Tab 4: Comparisons ===
 with tabs[4]:
+    import altair as alt
+    import plotly.express as px
+
     st.subheader("📌 Comparison with Other Creators")
 
     col1, col2, col3, col4 = st.columns([1, 2, 1, 2])
@@ -718,17 +920,29 @@ with tabs[4]:
         )
 
     # 2. Subscriber Growth Chart
-    df_sub = index_comparison.melt(
-        id_vars="Day",
-        value_vars=["MrBeast_Sub", "IShowSpeed_Sub", "DojaCat_Sub"],
-        var_name="Creator",
-        value_name="Subscriber Index",
-    ).replace(
-        {
-            "MrBeast_Sub": "MrBeast",
-            "IShowSpeed_Sub": "IShowSpeed",
-            "DojaCat_Sub": "Doja Cat",
-        }
+    import growth
+
+    all_creators = list(growth.CREATORS)
+    first_day, last_day = growth.date_range(all_creators)
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        selected_creators = st.multiselect(
+            "Creators", all_creators, default=all_creators
+        )
+    with col2:
+        baseline = st.date_input(
+            "Baseline date (index = start value)",
+            value=pd.Timestamp(growth.DEFAULT_BASELINE),
+            min_value=first_day,
+            max_value=last_day,
+        )
+    selected_creators = tuple(selected_creators or all_creators)
+
+    df_sub = (
+        growth.normalized_index(selected_creators, str(baseline), "subscribers")
+        .reset_index()
+        .melt(id_vars="Day", var_name="Creator", value_name="Subscriber Index")
     )
 
     sub_chart = (
@@ -754,17 +968,10 @@ with tabs[4]:
     st.altair_chart(sub_chart, use_container_width=True)
 
     # 3. View Growth Chart
-    df_view = index_comparison.melt(
-        id_vars="Day",
-        value_vars=["MrBeast_View", "IShowSpeed_View", "DojaCat_View"],
-        var_name="Creator",
-        value_name="View Index",
-    ).replace(
-        {
-            "MrBeast_View": "MrBeast",
-            "IShowSpeed_View": "IShowSpeed",
-            "DojaCat_View": "Doja Cat",
-        }
+    df_view = (
+        growth.normalized_index(selected_creators, str(baseline), "views")
+        .reset_index()
+        .melt(id_vars="Day", var_name="Creator", value_name="View Index")
     )
 
     view_chart = (
@@ -798,36 +1005,7 @@ with tabs[4]:
     # Grouped Bar Chart: Engagement Ratios
     st.subheader("💬 Engagement Ratios (Twitter)")
 
-    import numpy as np
-
-    # Map creator names to your already-loaded DataFrames
-    mrbeast_tweets = pd.read_csv("mrbeast_tweets.csv")
-    ishowspeed_tweets = pd.read_csv("ishowspeed_tweets.csv")
-    dojacat_tweets = pd.read_csv("dojacat_tweets.csv")
-
-    dfs = {
-        "MrBeast": mrbeast_tweets,
-        "IShowSpeed": ishowspeed_tweets,
-        "Doja Cat": dojacat_tweets,
-    }
-
-    results = []
-    for creator, df in dfs.items():
-        # drop any rows where Likes is zero or missing, to avoid division errors
-        df2 = df[df["Likes"] > 0].copy()
-
-        avg_replies_to_likes = (df2["Replies"] / df2["Likes"]).mean()
-        avg_retweets_to_likes = (df2["Retweets"] / df2["Likes"]).mean()
-
-        results.append(
-            {
-                "Creator": creator,
-                "Avg Replies-to-Likes Ratio": round(avg_replies_to_likes, 4),
-                "Avg Retweets-to-Likes Ratio": round(avg_retweets_to_likes, 4),
-            }
-        )
-
-    summary_df = pd.DataFrame(results)
+    summary_df = datastore.twitter_engagement()
 
     fig = px.bar(
         summary_df,
@@ -842,7 +1020,21 @@ with tabs[4]:
         title="🐦 Twitter Engagement Ratios",
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    charts.plotly_chart(fig, use_container_width=True)
+
+    with st.expander("🗂️ Per-Creator Pipeline Outputs"):
+        from pipeline import OUTPUT_NAMES
+
+        creator = st.selectbox("Creator", list(growth.CREATORS), key="outputs_creator")
+        outputs = {
+            name: datastore.creator_output(creator, name) for name in OUTPUT_NAMES
+        }
+        outputs = {name: df for name, df in outputs.items() if df is not None}
+        if outputs:
+            name = st.selectbox("Output", list(outputs), key="outputs_name")
+            st.dataframe(outputs[name], use_container_width=True)
+        else:
+            st.info(f"No outputs for {creator} yet. Run `python pipeline.py`.")
 
     st.subheader("What Sets IShowSpeed Apart from Others?")
 
@@ -868,75 +1060,78 @@ with tabs[4]:
 
 # === Tab 5: Conclusions ===
 with tabs[5]:
-    st.subheader("📊 IShowSpeed Growth Trends")
-
-    # --- Monthly Growth Data ---
-    df = pd.read_csv("ishowspeed_subscriber_growth.csv")
-    # --- Monthly Growth Aggregation ---
-    df["Day"] = pd.to_datetime(df["Day"])
-    df["Month"] = df["Day"].dt.to_period("M")
-    monthly = (
-        df.groupby("Month")
-        .agg({"Subscribers Gained": "sum", "Views Gained": "sum"})
-        .reset_index()
-    )
-    monthly["Month"] = monthly["Month"].dt.to_timestamp()
+    import plotly.graph_objects as go
+    import plotly.express as px
 
-    # Spike detection
-    sub_mean = monthly["Subscribers Gained"].mean()
-    sub_std = monthly["Subscribers Gained"].std()
-    view_mean = monthly["Views Gained"].mean()
-    view_std = monthly["Views Gained"].std()
+    import rollups
 
-    monthly["Sub Spike"] = monthly["Subscribers Gained"] > (sub_mean + 2 * sub_std)
-    monthly["View Spike"] = monthly["Views Gained"] > (view_mean + 2 * view_std)
+    st.subheader("📊 Growth Trends")
 
-    # --- Plotly: Monthly Subscriber Growth ---
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        growth_creator = st.selectbox(
+            "Creator", rollups.available_creators(), key="growth_creator"
+        )
+    with col2:
+        granularity = st.select_slider(
+            "Granularity", options=list(rollups.LEVELS), value="Month"
+        )
+
+    # --- Growth Data, pre-aggregated per granularity ---
+    periods = datastore.growth_pyramid(growth_creator).level(granularity)
+    adverb = rollups.ADVERBS[granularity]
+
+    # --- Plotly: Subscriber Growth ---
     fig1 = px.line(
-        monthly,
-        x="Month",
+        periods,
+        x=granularity,
         y="Subscribers Gained",
-        title="Monthly Subscriber Growth of IShowSpeed",
+        title=f"{adverb} Subscriber Growth of {growth_creator}",
     )
     fig1.add_trace(
         go.Scatter(
-            x=monthly[monthly["Sub Spike"]]["Month"],
-            y=monthly[monthly["Sub Spike"]]["Subscribers Gained"],
+            x=periods[periods["Sub Spike"]][granularity],
+            y=periods[periods["Sub Spike"]]["Subscribers Gained"],
             mode="markers+text",
             marker=dict(size=10, color="red"),
-            text=monthly[monthly["Sub Spike"]]["Subscribers Gained"].apply(
+            text=periods[periods["Sub Spike"]]["Subscribers Gained"].apply(
                 lambda x: f"{x:,}"
             ),
             textposition="top center",
             name="Spike",
         )
     )
-    st.plotly_chart(fig1, use_container_width=True)
+    charts.plotly_chart(fig1, use_container_width=True)
 
-    # --- Plotly: Monthly View Growth ---
+    # --- Plotly: View Growth ---
     fig2 = px.line(
-        monthly, x="Month", y="Views Gained", title="Monthly View Growth of IShowSpeed"
+        periods,
+        x=granularity,
+        y="Views Gained",
+        title=f"{adverb} View Growth of {growth_creator}",
     )
     fig2.add_trace(
         go.Scatter(
-            x=monthly[monthly["View Spike"]]["Month"],
-            y=monthly[monthly["View Spike"]]["Views Gained"],
+            x=periods[periods["View Spike"]][granularity],
+            y=periods[periods["View Spike"]]["Views Gained"],
             mode="markers+text",
             marker=dict(size=10, color="red"),
-            text=monthly[monthly["View Spike"]]["Views Gained"].apply(
+            text=periods[periods["View Spike"]]["Views Gained"].apply(
                 lambda x: f"{x:,}"
             ),
             textposition="top center",
             name="Spike",
         )
     )
-    st.plotly_chart(fig2, use_container_width=True)
+    charts.plotly_chart(fig2, use_container_width=True)
 
     # --- Audience Demographics ---
     st.subheader("🌍 Audience Demographics (Top 10 Countries)")
 
     # Extract country info
-    ishowspeed_followers_location = pd.read_csv("ishowspeed_followers_location.csv")
+    ishowspeed_followers_location = datastore.read_csv(
+        "ishowspeed_followers_location.csv"
+    )
     ishowspeed_followers_location = ishowspeed_followers_location.dropna(
         subset=["location"]
     )
@@ -1022,11 +1217,49 @@ with tabs[5]:
         color_discrete_sequence=pc.qualitative.Set3,
     )
     fig3.update_layout(showlegend=False)
-    st.plotly_chart(fig3, use_container_width=True)
+    charts.plotly_chart(fig3, use_container_width=True)
 
 
-# === Tab 6: Conclusions ===
+# === Tab 6: Search ===
 with tabs[6]:
+    import corpus
+
+    st.subheader("🔎 Search Comments, Tweets, Posts & Reddit")
+    search_index = datastore.search_index()
+
+    query = st.text_input(
+        "Search what people said",
+        placeholder="e.g. ronaldo, #SpeedComeToIran, 😭",
+    )
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        search_platforms = st.multiselect(
+            "Platform", corpus.PLATFORMS, default=corpus.PLATFORMS
+        )
+    with col2:
+        search_dates = st.date_input("Date range", value=())
+    with col3:
+        search_sentiments = st.multiselect(
+            "Sentiment",
+            ["positive", "neutral", "negative"],
+            default=["positive", "neutral", "negative"],
+        )
+
+    if query:
+        hits = search_index.search(
+            query,
+            platforms=search_platforms,
+            start=search_dates[0] if len(search_dates) > 0 else None,
+            end=search_dates[1] if len(search_dates) > 1 else None,
+            sentiments=search_sentiments + ["unscored"],
+            limit=100,
+        )
+        st.caption(f"{len(hits)} results from {len(search_index):,} documents")
+        st.dataframe(hits.drop(columns="key"), use_container_width=True)
+
+
+# === Tab 7: Conclusions ===
+with tabs[7]:
     st.header("🔮 Final Thoughts & Future")
     st.markdown(
         """
@@ -1036,3 +1269,12 @@ with tabs[6]:
     - **Opportunities**: Potential to expand into music collabs, brand deals, or live event streams.
     """
     )
+
+# === Startup Timing ===
+with st.sidebar.expander("⏱️ Startup timing"):
+    st.caption(
+        f"Data snapshot {snapshot['version']}" if snapshot else "Data: loose CSVs"
+    )
+    st.caption(f"This run took {time.perf_counter() - script_started:.2f}s")
+    st.caption("Warm-up " + ("finished" if warmup.is_done() else "still running"))
+    st.dataframe(pd.DataFrame(warmup.report()), hide_index=True)
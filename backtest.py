@@ -0,0 +1,232 @@
+"""Rolling-origin backtests of the growth forecasts.
+
+For every month ``t`` with at least ``min_train`` months of history, each
+model is fit on the months before ``t`` (all of them, or only the last
+``window``) and forecasts the next ``horizon`` months. Comparing those
+forecasts with what happened gives MAE, MAPE and the share of actual values
+inside the model's prediction interval (coverage), per model and horizon.
+
+All folds of a model are fit at once: a fold is one row of a
+(folds x months) training mask, so a fit is a handful of masked numpy
+reductions. Series (creator x metric) are independent and can be spread
+over processes with ``workers``.
+
+    python backtest.py --creator IShowSpeed --metric subscribers
+
+Models:
+
+    naive   the last observed value
+    drift   the line from the first to the last observed value, extended
+    linear  a least-squares trend on date ordinals (``forecast``), as the
+            dashboard's forecasts are fit
+
+Creators without a raw growth CSV are evaluated on the notebook's
+normalized levels (see ``growth``). MAPE and coverage do not depend on the
+scale; MAE is in that series' units.
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import forecast
+import growth
+from creators import CREATORS
+
+HORIZON = 12  # months ahead
+MIN_TRAIN = 12  # months of history before the first origin
+INTERVAL = 0.8
+Z_SCORES = {0.8: 1.2816, 0.9: 1.6449, 0.95: 1.96}
+
+# (model, training window in months or None for all history)
+GRID = [
+    ("naive", None),
+    ("drift", None),
+    ("drift", 12),
+    ("linear", None),
+    ("linear", 12),
+    ("linear", 6),
+]
+
+
+def model_name(model, window):
+    return model if window is None else f"{model} ({window}m)"
+
+
+def monthly_series(creator, metric):
+    """Month-end subscriber totals, or views gained per month."""
+    levels = growth.load_creator_levels(creator, metric).resample("ME").last()
+    if metric == "views":
+        levels = levels.diff().iloc[1:]
+    return levels.dropna()
+
+
+def _folds(length, min_train, window):
+    """Origins and the (folds x length) mask of each fold's training months."""
+    origins = np.arange(min_train, length)
+    months = np.arange(length)
+    mask = months[None, :] < origins[:, None]
+    if window is not None:
+        mask &= months[None, :] >= (origins - window)[:, None]
+    return origins, mask
+
+
+def _naive(x, y, mask, origins, steps):
+    last = y[origins - 1]
+    diffs = np.diff(y, prepend=np.nan)
+    s = _masked_std(diffs, mask & np.roll(mask, 1, axis=1))
+    return np.repeat(last[:, None], len(steps), axis=1), s[:, None] * np.sqrt(steps)
+
+
+def _drift(x, y, mask, origins, steps):
+    first = np.argmax(mask, axis=1)
+    n = mask.sum(axis=1)
+    last = y[origins - 1]
+    slope = (last - y[first]) / np.maximum(n - 1, 1)
+    diffs = np.diff(y, prepend=np.nan)
+    residuals = diffs[None, :] - slope[:, None]
+    s = _masked_std(residuals, mask & np.roll(mask, 1, axis=1))
+    h = steps[None, :]
+    se = s[:, None] * np.sqrt(h * (1 + h / np.maximum(n - 1, 1)[:, None]))
+    return last[:, None] + slope[:, None] * h, se
+
+
+def _linear(x, y, mask, origins, steps):
+    n = mask.sum(axis=1)
+    mean_x = np.where(mask, x, 0).sum(axis=1) / n
+    mean_y = np.where(mask, y, 0).sum(axis=1) / n
+    dx = np.where(mask, x[None, :] - mean_x[:, None], 0)
+    dy = np.where(mask, y[None, :] - mean_y[:, None], 0)
+    sxx = (dx * dx).sum(axis=1)
+    slope = (dx * dy).sum(axis=1) / sxx
+    sse = ((dy - slope[:, None] * dx) ** 2).sum(axis=1)
+    s = np.sqrt(sse / np.maximum(n - 2, 1))
+
+    target = origins[:, None] + steps[None, :] - 1
+    future_x = x[np.minimum(target, len(x) - 1)]
+    prediction = mean_y[:, None] + slope[:, None] * (future_x - mean_x[:, None])
+    leverage = 1 + 1 / n[:, None] + (future_x - mean_x[:, None]) ** 2 / sxx[:, None]
+    return prediction, s[:, None] * np.sqrt(leverage)
+
+
+def _masked_std(values, mask):
+    values = np.broadcast_to(values, mask.shape)
+    count = mask.sum(axis=1)
+    mean = np.where(mask, values, 0).sum(axis=1) / np.maximum(count, 1)
+    squares = np.where(mask, (values - mean[:, None]) ** 2, 0).sum(axis=1)
+    return np.sqrt(squares / np.maximum(count - 1, 1))
+
+
+MODELS = {"naive": _naive, "drift": _drift, "linear": _linear}
+
+
+def evaluate(
+    series, grid=GRID, horizon=HORIZON, min_train=MIN_TRAIN, interval=INTERVAL
+):
+    """Per model and horizon errors of rolling-origin forecasts of ``series``.
+
+    ``series`` is indexed by date. Returns one row per (model, horizon) with
+    the number of folds that could be scored at that horizon.
+    """
+    y = series.to_numpy(dtype=float)
+    # Ordinals relative to the first month keep the sums well conditioned
+    x = forecast.to_ordinals(series.index).astype(float)
+    x -= x[0]
+    steps = np.arange(1, horizon + 1)
+    z = Z_SCORES[interval]
+
+    rows = []
+    for model, window in grid:
+        origins, mask = _folds(len(y), min_train, window)
+        if len(origins) == 0:
+            continue
+        prediction, se = MODELS[model](x, y, mask, origins, steps)
+        target = origins[:, None] + steps[None, :] - 1
+        scored = target < len(y)
+        actual = np.where(scored, y[np.minimum(target, len(y) - 1)], np.nan)
+        error = np.abs(prediction - actual)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percent = np.where(actual != 0, error / np.abs(actual), np.nan)
+        covered = error <= z * se
+        folds = scored.sum(axis=0)
+        rows.append(
+            pd.DataFrame(
+                {
+                    "Model": model_name(model, window),
+                    "Horizon": steps,
+                    "Folds": folds,
+                    "MAE": np.nanmean(np.where(scored, error, np.nan), axis=0),
+                    "MAPE": np.nanmean(np.where(scored, percent, np.nan), axis=0),
+                    "Coverage": np.where(
+                        folds > 0,
+                        (covered & scored).sum(axis=0) / np.maximum(folds, 1),
+                        np.nan,
+                    ),
+                }
+            )
+        )
+    return pd.concat(rows, ignore_index=True)
+
+
+def _evaluate_task(task):
+    creator, metric, kwargs = task
+    result = evaluate(monthly_series(creator, metric), **kwargs)
+    return result.assign(Creator=creator, Metric=metric)
+
+
+def backtest(creators=None, metrics=None, workers=None, **kwargs):
+    """``evaluate`` every (creator, metric) series, ``workers`` processes wide."""
+    tasks = [
+        (creator, metric, kwargs)
+        for creator in creators or CREATORS
+        for metric in metrics or growth.METRICS
+    ]
+    if workers == 1 or len(tasks) == 1:
+        results = list(map(_evaluate_task, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_evaluate_task, tasks))
+    df = pd.concat(results, ignore_index=True)
+    columns = ["Creator", "Metric", "Model", "Horizon", "Folds"]
+    return df[columns + ["MAE", "MAPE", "Coverage"]]
+
+
+def summarize(results, horizons=(1, 3, 6, 12)):
+    """MAPE and coverage per creator, metric and model at a few horizons."""
+    df = results[results["Horizon"].isin(horizons)]
+    return df.pivot_table(
+        index=["Creator", "Metric", "Model"],
+        columns="Horizon",
+        values=["MAPE", "Coverage"],
+        sort=False,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--creator", action="append", choices=list(CREATORS))
+    parser.add_argument("--metric", action="append", choices=list(growth.METRICS))
+    parser.add_argument("--horizon", type=int, default=HORIZON)
+    parser.add_argument("--min-train", type=int, default=MIN_TRAIN)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = backtest(
+        args.creator,
+        args.metric,
+        workers=args.workers,
+        horizon=args.horizon,
+        min_train=args.min_train,
+    )
+    elapsed = time.perf_counter() - started
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(summarize(results).round(3))
+    print(f"\n{len(results):,} (model, horizon) scores in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
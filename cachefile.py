@@ -0,0 +1,40 @@
+"""Versioned pickle files for the on-disk caches under ``.cache``.
+
+A cache file holds one dict with a ``version`` entry; ``load`` ignores a
+file written by another format version, and ``dump`` replaces the file
+atomically so a reader never sees half of it.
+
+Caches that pickle instances of their own classes must be written from the
+imported module, not from ``__main__``: pickle records a class by the name
+of its module, and ``__main__.Segmenter`` cannot be loaded by the
+dashboard. Their command lines therefore end with ``run_main``.
+"""
+
+import importlib
+import os
+import pickle
+
+
+def load(path, version):
+    """The dict stored at ``path``, or None if missing or of another version."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        state = pickle.load(f)
+    return state if state.get("version") == version else None
+
+
+def dump(path, version, **state):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        pickle.dump({"version": version, **state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def run_main(module):
+    """Run ``module.main()`` from the imported module (see above).
+
+    Use as ``if __name__ == "__main__": cachefile.run_main("sketches")``.
+    """
+    importlib.import_module(module).main()
@@ -0,0 +1,250 @@
+"""Change points in the daily sentiment series (PELT).
+
+Each platform's daily positive, negative and net sentiment counts (from
+``*_sentiment_over_time.csv``, read through ``datastore`` so a published
+snapshot is used, missing days counted as 0) are split into
+segments of constant level with PELT (Killick et al., 2012). PELT finds the
+segmentation minimising total segment cost plus ``penalty`` per change,
+and prunes candidate segment starts that can no longer be optimal, so a run
+is linear in the number of days in practice. Positive and negative counts
+use a Poisson cost; net sentiment, which can be negative, a Gaussian one
+whose noise variance is estimated robustly from all days seen.
+
+PELT's state after day ``t`` only depends on days up to ``t`` (and on the
+noise variance). The state is pickled to ``.cache/changepoints.pkl`` and
+resumed when days are appended. A series is segmented again from scratch
+if a day already processed changed, or if the appended days changed the
+noise estimate, so a resumed run always equals a run over all days.
+
+    python changepoints.py --platform Twitter
+    python changepoints.py --check       # resumed runs equal full runs
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+import cachefile
+import datastore
+
+CACHE_PATH = os.path.join(".cache", "changepoints.pkl")
+FORMAT_VERSION = 2
+
+SENTIMENT_FILES = datastore.SENTIMENT_FILES
+SERIES = {"positive": "poisson", "negative": "poisson", "net_sentiment": "normal"}
+
+PENALTY = 15.0  # cost of one more change; higher finds fewer, larger events
+MIN_CHANGE = 2.0  # mentions/day a level must move by to be reported
+
+
+def noise_scale(values):
+    """Noise variance of a series from its day-to-day differences.
+
+    The median absolute deviation ignores the few large jumps at changes.
+    """
+    diffs = np.diff(np.asarray(values, dtype=float))
+    mad = np.median(np.abs(diffs - np.median(diffs))) if len(diffs) else 0
+    return max((1.4826 * mad) ** 2 / 2, 1.0)
+
+
+class Segmenter:
+    """Incremental PELT over one series, fed with ``update``.
+
+    The Gaussian cost's variance is ``scale`` if given, else ``noise_scale``
+    of all days seen so far.
+    """
+
+    def __init__(self, cost="poisson", penalty=PENALTY, scale=None):
+        self.cost = cost
+        self.penalty = penalty
+        self.fixed_scale = scale is not None
+        self.scale = scale
+        self._reset()
+
+    def _reset(self):
+        self.values = np.empty(0)
+        self.sums = np.zeros(1)  # prefix sums of values and of their squares
+        self.squares = np.zeros(1)
+        self.best = np.array([-self.penalty])  # F(t), optimal cost of days [0, t)
+        self.last_change = np.zeros(1, dtype=np.int64)
+        self.candidates = np.zeros(1, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.values)
+
+    def _segment_costs(self, starts, end):
+        n = end - starts
+        total = self.sums[end] - self.sums[starts]
+        if self.cost == "poisson":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                loglik = np.where(total > 0, total * np.log(total / n), 0.0)
+            return 2 * (total - loglik)
+        squares = self.squares[end] - self.squares[starts]
+        return (squares - total * total / n) / self.scale
+
+    def matches(self, values):
+        """Whether ``values`` extends the processed days without changing them."""
+        return len(values) >= len(self) and np.array_equal(
+            values[: len(self)], self.values
+        )
+
+    def update(self, values):
+        """Process the days of ``values`` after the ones already seen.
+
+        Returns the number of days processed: all of them if the noise
+        estimate changed and the series was segmented again.
+        """
+        values = np.asarray(values, dtype=float)
+        if len(values) <= len(self):
+            return 0
+        if self.cost == "normal" and not self.fixed_scale:
+            scale = noise_scale(values)
+            if scale != self.scale:
+                self._reset()
+                self.scale = scale
+        new = values[len(self) :]
+        start = len(self)
+        self.values = np.concatenate([self.values, new])
+        self.sums = np.concatenate([self.sums, self.sums[-1] + np.cumsum(new)])
+        self.squares = np.concatenate(
+            [self.squares, self.squares[-1] + np.cumsum(new * new)]
+        )
+        best = np.concatenate([self.best, np.empty(len(new))])
+        last_change = np.concatenate([self.last_change, np.empty(len(new), np.int64)])
+        candidates = self.candidates
+        for end in range(start + 1, len(self.values) + 1):
+            totals = best[candidates] + self._segment_costs(candidates, end)
+            i = np.argmin(totals)
+            best[end] = totals[i] + self.penalty
+            last_change[end] = candidates[i]
+            # Prune starts that can never beat the optimum again
+            keep = totals <= best[end]
+            candidates = np.append(candidates[keep], end)
+        self.best, self.last_change, self.candidates = best, last_change, candidates
+        return len(new)
+
+    def changes(self):
+        """Indices where a new segment starts, oldest first (0 excluded)."""
+        starts, end = [], len(self)
+        while end > 0:
+            end = int(self.last_change[end])
+            starts.append(end)
+        return sorted(starts)[1:]
+
+    def segments(self):
+        """(start, end, mean) of every segment."""
+        bounds = [0, *self.changes(), len(self)]
+        return [
+            (a, b, (self.sums[b] - self.sums[a]) / (b - a))
+            for a, b in zip(bounds[:-1], bounds[1:])
+        ]
+
+
+def daily_series(path):
+    """The sentiment counts of one file, one row per calendar day."""
+    df = datastore.read_csv(path)
+    df["date"] = pd.to_datetime(df["date"])
+    daily = df.groupby(df["date"].dt.normalize())[list(SERIES)].sum()
+    days = pd.date_range(daily.index.min(), daily.index.max(), freq="D")
+    return daily.reindex(days, fill_value=0).rename_axis("date")
+
+
+def load_or_update(path=CACHE_PATH, files=SENTIMENT_FILES):
+    """Segmenters per (platform, series), with any new days processed."""
+    cached = cachefile.load(path, FORMAT_VERSION)
+    state = cached["segmenters"] if cached else {}
+
+    segmenters, days, changed = {}, {}, False
+    for platform, csv_path in files.items():
+        daily = daily_series(csv_path)
+        days[platform] = daily.index
+        for column, cost in SERIES.items():
+            key = (platform, column)
+            values = daily[column].to_numpy(dtype=float)
+            segmenter, first_day = state.get(key, (None, None))
+            if segmenter is None or first_day != daily.index[0]:
+                segmenter = Segmenter(cost)
+            elif not segmenter.matches(values):
+                segmenter = Segmenter(cost)
+            changed |= segmenter.update(values) > 0
+            segmenters[key] = (segmenter, daily.index[0])
+
+    if changed or set(segmenters) != set(state):
+        cachefile.dump(path, FORMAT_VERSION, segmenters=segmenters)
+    return {key: segmenter for key, (segmenter, _) in segmenters.items()}, days
+
+
+def detect_events(min_change=MIN_CHANGE, path=CACHE_PATH, files=SENTIMENT_FILES):
+    """One row per change in level, largest moves first.
+
+    ``Before`` and ``After`` are mean mentions per day in the segments on
+    either side of the change; ``Until`` is the last day of the new level.
+    """
+    segmenters, days = load_or_update(path, files)
+    rows = []
+    for (platform, column), segmenter in segmenters.items():
+        segments = segmenter.segments()
+        for previous, (start, end, level) in zip(segments, segments[1:]):
+            change = level - previous[2]
+            if abs(change) < min_change:
+                continue
+            rows.append(
+                {
+                    "Date": days[platform][start],
+                    "Until": days[platform][end - 1],
+                    "Platform": platform,
+                    "Series": column,
+                    "Before": round(previous[2], 2),
+                    "After": round(level, 2),
+                    "Change": round(change, 2),
+                }
+            )
+    columns = ["Date", "Until", "Platform", "Series", "Before", "After", "Change"]
+    events = pd.DataFrame(rows, columns=columns)
+    order = events["Change"].abs().sort_values(ascending=False).index
+    return events.loc[order].reset_index(drop=True)
+
+
+def check_resume(files=SENTIMENT_FILES, batches=5):
+    """(platform, series) whose change points differ between a run fed in
+    ``batches`` growing prefixes and a run over all days at once."""
+    mismatches = []
+    for platform, csv_path in files.items():
+        daily = daily_series(csv_path)
+        for column, cost in SERIES.items():
+            values = daily[column].to_numpy(dtype=float)
+            full = Segmenter(cost)
+            full.update(values)
+            resumed = Segmenter(cost)
+            for end in np.linspace(0, len(values), batches + 1).astype(int)[1:]:
+                resumed.update(values[:end])
+            if resumed.changes() != full.changes():
+                mismatches.append((platform, column))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--platform", action="append", choices=list(SENTIMENT_FILES))
+    parser.add_argument("--min-change", type=float, default=MIN_CHANGE)
+    parser.add_argument(
+        "--check", action="store_true", help="check resumed runs against full runs"
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        mismatches = check_resume()
+        for platform, column in mismatches:
+            print(f"{platform} {column}: resumed run differs from the full run")
+        raise SystemExit(1 if mismatches else 0)
+    events = detect_events(args.min_change)
+    if args.platform:
+        events = events[events["Platform"].isin(args.platform)]
+    with pd.option_context("display.width", 200):
+        print(events.to_string(index=False))
+
+
+if __name__ == "__main__":
+    cachefile.run_main("changepoints")
@@ -0,0 +1,83 @@
+"""Plotly figure preparation for large traces.
+
+``plotly_chart`` replaces ``st.plotly_chart`` in the dashboard. Before a
+figure is sent to the browser it
+
+- swaps SVG ``scatter`` traces with more than ``WEBGL_THRESHOLD`` points
+  for WebGL ``scattergl``, which draws hundreds of thousands of markers
+  without freezing the page, and
+- turns date arrays into epoch milliseconds on a date axis, and lossless
+  float64 arrays into float32. Plotly serializes numpy arrays as base64
+  typed arrays, so a date costs 8 bytes instead of a 26-character ISO
+  string.
+"""
+
+import numpy as np
+import streamlit as st
+
+WEBGL_THRESHOLD = 1000  # points per trace, as plotly express "auto" uses
+
+_ARRAY_ATTRIBUTES = ["x", "y", "customdata"]
+
+
+def _use_webgl(fig):
+    """``fig``, or a copy with the large SVG scatter traces in WebGL."""
+    import plotly.graph_objects as go
+
+    traces, swapped = [], False
+    for trace in fig.data:
+        if trace.type == "scatter" and trace.x is not None:
+            if len(trace.x) > WEBGL_THRESHOLD:
+                properties = trace.to_plotly_json()
+                properties.pop("type")
+                try:
+                    trace, swapped = go.Scattergl(properties), True
+                except ValueError:  # an SVG-only property; keep the trace
+                    pass
+        traces.append(trace)
+    if not swapped:
+        return fig
+    return go.Figure(data=traces, layout=fig.layout)
+
+
+def _compact_array(values):
+    """A smaller numeric array for ``values``, or None to leave it alone."""
+    if values is None or isinstance(values, (str, dict)):
+        return None
+    values = np.asarray(values)
+    if values.dtype.kind == "M":
+        millis = values.astype("datetime64[ms]")
+        return np.where(np.isnat(millis), np.nan, millis.astype(np.int64)), "date"
+    if values.dtype == np.float64:
+        narrow = values.astype(np.float32)
+        if np.array_equal(narrow, values, equal_nan=True):
+            return narrow, None
+    return None
+
+
+def compact(fig):
+    """Typed-array friendly copies of every trace's numeric arrays."""
+    for trace in fig.data:
+        for attribute in _ARRAY_ATTRIBUTES:
+            if attribute not in trace:
+                continue
+            compacted = _compact_array(trace[attribute])
+            if compacted is None:
+                continue
+            values, axis_type = compacted
+            if axis_type is not None:
+                if attribute == "customdata":
+                    continue  # hover templates would show raw numbers
+                axis = trace[f"{attribute}axis"] or attribute  # "x", "x2", ...
+                fig.layout[f"{attribute}axis{axis[1:]}"].type = axis_type
+            trace[attribute] = values
+    return fig
+
+
+def prepare(fig):
+    return compact(_use_webgl(fig))
+
+
+def plotly_chart(fig, **kwargs):
+    """``st.plotly_chart`` for a figure run through ``prepare``."""
+    return st.plotly_chart(prepare(fig), **kwargs)
@@ -0,0 +1,404 @@
+"""Collect the raw per-creator CSVs from the RapidAPI endpoints.
+
+Ported from the notebook's collection cells, parameterized by creator (see
+``creators.py``). Every request goes through ``http_cache.ResponseCache``,
+so a rerun only downloads what is stale, and ``--offline`` rebuilds every
+raw CSV from cached responses alone: continuation tokens come out of the
+cached pages, so the same requests are replayed in the same order.
+
+    RAPIDAPI_KEY=... python collectors.py --creator MrBeast
+    python collectors.py --offline        # rebuild all CSVs, no network
+
+The RapidAPI key is read from ``RAPIDAPI_KEY`` and is not part of the
+cache key.
+"""
+
+import argparse
+import csv
+import os
+import time
+
+import pandas as pd
+
+from creators import CREATORS, input_file
+from http_cache import DEFAULT_MAX_AGE, MODES, CacheMiss, ResponseCache
+
+YOUTUBE_COMMENTS_PER_VIDEO = 20
+PUBLIC_TWEET_LIMIT = 1000
+REDDIT_POST_LIMIT = 2000
+INSTAGRAM_POST_LIMIT = 60
+EMPTY_PAGE_LIMIT = 3  # consecutive empty tweet pages before giving up
+GONE_STATUSES = (403, 404)  # a deleted video or post, or comments turned off
+
+TWEET_HEADER = ["Tweet ID", "Text", "Created At", "Views", "Likes", "Retweets", "Replies", "Quotes"]  # fmt: skip
+
+
+class CollectorError(RuntimeError):
+    """A request of a collection failed; its CSV is left as it was."""
+
+
+def _headers(host):
+    return {
+        "x-rapidapi-key": os.environ.get("RAPIDAPI_KEY", ""),
+        "x-rapidapi-host": host,
+    }
+
+
+def _pause(response):
+    if not response.from_cache:
+        time.sleep(1)  # be kind to the API
+
+
+def _get(http, url, params, headers, item=False):
+    """The response to a GET; any status but 200 fails the whole collection,
+    so a partial result never overwrites a complete CSV.
+
+    With ``item``, the request is for one video or post, and a 403 or 404
+    (it is gone, or its comments are off) returns None so the caller can
+    skip it, as the notebook did.
+    """
+    response = http.get(url, params=params, headers=headers)
+    if item and response.status_code in GONE_STATUSES:
+        return None
+    if response.status_code != 200:
+        raise CollectorError(f"{url}: {response.status_code} - {response.text}")
+    return response
+
+
+def _first_page(http, url, params, headers):
+    return _get(http, url, params, headers).json()
+
+
+def _check_any_found(kind, gone, total):
+    # Every item "gone" is an API or key problem, not a deleted catalogue
+    if total and gone == total:
+        raise CollectorError(f"{kind}: none of the {total} requests succeeded")
+
+
+def _write_csv(path, header, rows):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(header)
+        writer.writerows(rows)
+    os.replace(tmp, path)
+    return len(rows)
+
+
+def collect_growth(creator, http):
+    url = "https://viewstats.p.rapidapi.com/v1/channel_stats"
+    params = {
+        "channel_id": CREATORS[creator]["youtube_channel_id"],
+        "range": "alltime",
+        "groupBy": "daily",
+        "sortOrder": "ASC",
+    }
+    data = _first_page(http, url, params, _headers("viewstats.p.rapidapi.com"))
+    rows = [
+        [
+            entry.get("insertedAt", ""),
+            entry.get("subscriberCount", 0),
+            entry.get("subscriberCountDelta", 0),
+            entry.get("viewCount", 0),
+            entry.get("viewCountDelta", 0),
+        ]
+        for entry in data.get("data", [])
+    ]
+    header = ["Day", "Total Subscribers", "Subscribers Gained", "Total Views", "Views Gained"]  # fmt: skip
+    return header, rows
+
+
+def collect_youtube_videos(creator, http):
+    url = "https://youtube-v2.p.rapidapi.com/channel/videos"
+    headers = _headers("youtube-v2.p.rapidapi.com")
+    channel_id = CREATORS[creator]["youtube_channel_id"]
+
+    data = _first_page(http, url, {"channel_id": channel_id}, headers)
+    videos = data.get("videos", [])
+    token = data.get("continuation_token")
+    while token:
+        params = {"channel_id": channel_id, "continuation_token": token}
+        response = _get(http, f"{url}/continuation", params, headers)
+        data = response.json()
+        videos.extend(data.get("videos", []))
+        token = data.get("continuation_token")
+        _pause(response)
+
+    rows = [
+        [
+            video.get("title"),
+            video.get("video_id"),
+            video.get("published_time"),
+            video.get("number_of_views"),
+            video.get("category"),
+            video.get("type"),
+        ]
+        for video in videos
+    ]
+    return ["Title", "Video ID", "Published At", "Views", "Category", "Type"], rows
+
+
+def collect_youtube_comments(creator, http):
+    """Top comments of every video in the creator's video CSV."""
+    url = "https://youtube-v2.p.rapidapi.com/video/comments"
+    headers = _headers("youtube-v2.p.rapidapi.com")
+    videos = pd.read_csv(input_file(creator, "youtube_videos"), dtype=str)
+
+    rows, gone = [], 0
+    for video_id, title in zip(videos["Video ID"], videos["Title"]):
+        response = _get(http, url, {"video_id": video_id}, headers, item=True)
+        if response is None:
+            gone += 1
+            continue
+        data = response.json()
+        comments = data.get("comments", [])
+        token = data.get("continuation_token")
+        while len(comments) < YOUTUBE_COMMENTS_PER_VIDEO and token:
+            params = {"video_id": video_id, "continuation_token": token}
+            response = _get(http, f"{url}/continuation", params, headers, item=True)
+            if response is None:
+                break
+            data = response.json()
+            comments.extend(data.get("comments", []))
+            token = data.get("continuation_token")
+            _pause(response)
+
+        rows.extend(
+            [
+                video_id,
+                title,
+                comment.get("id"),
+                comment.get("author_name"),
+                comment.get("published_time"),
+                comment.get("like_count"),
+                comment.get("text"),
+            ]
+            for comment in comments[:YOUTUBE_COMMENTS_PER_VIDEO]
+        )
+    _check_any_found("youtube_comments", gone, len(videos))
+    header = ["Video ID", "Video Title", "Comment ID", "Author", "Published Time", "Likes", "Comment Text"]  # fmt: skip
+    return header, rows
+
+
+def _tweet_rows(tweets):
+    return [
+        [
+            tweet.get("tweet_id"),
+            tweet.get("text"),
+            tweet.get("creation_date"),
+            tweet.get("views"),
+            tweet.get("favorite_count"),
+            tweet.get("retweet_count"),
+            tweet.get("reply_count"),
+            tweet.get("quote_count"),
+        ]
+        for tweet in tweets
+    ]
+
+
+def _paged_tweets(http, url, params, limit=None):
+    headers = _headers("twitter154.p.rapidapi.com")
+    data = _first_page(http, url, params, headers)
+    tweets = data.get("results", [])
+    token = data.get("continuation_token")
+    empty_pages = 0
+    while token and (limit is None or len(tweets) < limit):
+        page_params = {**params, "continuation_token": token}
+        response = _get(http, f"{url}/continuation", page_params, headers)
+        data = response.json()
+        page = data.get("results", [])
+        empty_pages = 0 if page else empty_pages + 1
+        if empty_pages >= EMPTY_PAGE_LIMIT:
+            break
+        tweets.extend(page)
+        token = data.get("continuation_token")
+        _pause(response)
+    return tweets
+
+
+def collect_tweets(creator, http):
+    url = "https://twitter154.p.rapidapi.com/user/tweets"
+    params = {"username": CREATORS[creator]["twitter_username"]}
+    return TWEET_HEADER, _tweet_rows(_paged_tweets(http, url, params))
+
+
+def collect_public_tweets(creator, http):
+    url = "https://twitter154.p.rapidapi.com/search/search"
+    params = {
+        "query": CREATORS[creator]["key"],
+        "section": "top",
+        "min_retweets": "1",
+        "min_likes": "1",
+        "limit": "20",
+        "start_date": "2020-01-01",
+        "language": "en",
+    }
+    tweets = _paged_tweets(http, url, params, limit=PUBLIC_TWEET_LIMIT)
+    return TWEET_HEADER, _tweet_rows(tweets)
+
+
+def collect_reddit_posts(creator, http):
+    url = "https://reddit-com.p.rapidapi.com/posts/search-posts"
+    headers = _headers("reddit-com.p.rapidapi.com")
+    query = CREATORS[creator]["reddit_query"]
+    params = {"query": query, "sort": "relevance", "time": "all"}
+
+    posts = []
+    while len(posts) < REDDIT_POST_LIMIT:
+        response = _get(http, url, params, headers)
+        data = response.json()
+        page = data.get("data", [])
+        posts.extend(page)
+        next_page = data.get("meta", {}).get("nextPage")
+        if not next_page or not page:
+            break
+        params = {**params, "nextPage": next_page}
+        _pause(response)
+
+    rows = [
+        [
+            post.get("postTitle", ""),
+            post.get("score", 0),
+            post.get("commentCount", 0),
+            post.get("createdAt", ""),
+        ]
+        for post in posts[:REDDIT_POST_LIMIT]
+    ]
+    return ["Title", "Score", "Number of Comments", "Created At"], rows
+
+
+def collect_instagram_posts(creator, http):
+    url = "https://instagram-social-api.p.rapidapi.com/v1/posts"
+    headers = _headers("instagram-social-api.p.rapidapi.com")
+    username = CREATORS[creator]["instagram_username"]
+    params = {"username_or_id_or_url": f"https://www.instagram.com/{username}/"}
+
+    posts = []
+    while len(posts) < INSTAGRAM_POST_LIMIT:
+        response = _get(http, url, params, headers)
+        data = response.json()
+        page = data.get("data", {}).get("items", [])
+        if not page:
+            break
+        posts.extend(page)
+        token = data.get("pagination_token")
+        if not token:
+            break
+        params = {**params, "pagination_token": token}
+        _pause(response)
+
+    rows = []
+    for post in posts:
+        caption = post.get("caption") or {}
+        rows.append(
+            [
+                caption.get("id", ""),
+                post.get("code", ""),
+                caption.get("text", ""),
+                caption.get("text_translation", ""),
+                post.get("like_count", 0),
+                post.get("comments_count", 0),
+                caption.get("created_at", ""),
+            ]
+        )
+    header = ["Post ID", "Code", "Post Text", "Translated Text", "Likes", "Comments", "Timestamp"]  # fmt: skip
+    return header, rows
+
+
+def collect_instagram_comments(creator, http):
+    """First two comment pages of every post in the creator's post CSV."""
+    url = "https://instagram-social-api.p.rapidapi.com/v1/comments"
+    headers = _headers("instagram-social-api.p.rapidapi.com")
+    posts = pd.read_csv(input_file(creator, "instagram_posts"), dtype=str)
+
+    codes = posts["Code"].dropna()
+    rows, gone = [], 0
+    for code in codes:
+        params = {"code_or_id_or_url": code}
+        for page in range(2):
+            response = _get(http, url, params, headers, item=True)
+            if response is None:
+                gone += 1 if page == 0 else 0
+                break
+            data = response.json().get("data", {})
+            rows.extend(
+                [
+                    code,
+                    comment.get("id", ""),
+                    comment.get("text", ""),
+                    comment.get("created_at", ""),
+                ]
+                for comment in data.get("items", [])
+            )
+            token = data.get("pagination_token")
+            _pause(response)
+            if not token:
+                break
+            params = {"code_or_id_or_url": code, "pagination_token": token}
+    _check_any_found("instagram_comments", gone, len(codes))
+    return ["Post Code", "Comment ID", "Comment Text", "Timestamp"], rows
+
+
+# Collection order matters: comments are fetched for the collected videos/posts
+COLLECTORS = {
+    "growth": collect_growth,
+    "youtube_videos": collect_youtube_videos,
+    "youtube_comments": collect_youtube_comments,
+    "tweets": collect_tweets,
+    "public_tweets": collect_public_tweets,
+    "reddit_posts": collect_reddit_posts,
+    "instagram_posts": collect_instagram_posts,
+    "instagram_comments": collect_instagram_comments,
+}
+
+
+def collect(creator, kind, http):
+    """Run one collector and write its CSV; returns the number of rows."""
+    header, rows = COLLECTORS[kind](creator, http)
+    return _write_csv(input_file(creator, kind), header, rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--creator", action="append", choices=list(CREATORS))
+    parser.add_argument("--source", action="append", choices=list(COLLECTORS))
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--offline",
+        action="store_const",
+        dest="mode",
+        const="offline",
+        help="rebuild the CSVs from cached responses only",
+    )
+    mode.add_argument(
+        "--refresh",
+        action="store_const",
+        dest="mode",
+        const="refresh",
+        help="revalidate every cached response",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=DEFAULT_MAX_AGE / 3600,
+        help="hours before a cached response is revalidated (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    http = ResponseCache(mode=args.mode or MODES[0], max_age=args.max_age * 3600)
+    started = time.perf_counter()
+    for creator in args.creator or CREATORS:
+        for kind in args.source or COLLECTORS:
+            path = input_file(creator, kind)
+            try:
+                print(f"{path:<45} {collect(creator, kind, http):>6} rows")
+            except (CacheMiss, CollectorError, FileNotFoundError) as e:
+                print(f"{path:<45} skipped: {e}")
+    print(
+        f"\n{http.stats['hits']} cached, {http.stats['revalidated']} revalidated, "
+        f"{http.stats['downloaded']} downloaded in {time.perf_counter() - started:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
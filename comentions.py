@@ -0,0 +1,281 @@
+"""Sparse co-mention graph of the people and handles fans talk about.
+
+Every document (comment, tweet, post, Reddit title) of every creator is
+scanned for known people (``ENTITIES``, matched on word boundaries through
+their aliases) and for @handles. The hits form a sparse
+(documents x entities) incidence matrix ``D``. The graph is kept as three
+sparse products, all updated by adding the products of new documents only:
+
+    creator_counts  (creators x entities)  documents of a creator naming e
+    co_counts       (entities x entities)  documents naming both, D.T @ D
+    entity_counts   (entities)             documents naming e
+
+From these, association strength is the lift P(a, b) / (P(a) P(b)) and the
+PMI is its log. ``related`` ranks the entities named in a creator's
+documents, with their lift over the whole corpus. ``co_mentions`` ranks the entities
+mentioned together with one entity.
+
+The graph is pickled to ``.cache/comentions.pkl`` and documents already in
+it are skipped on the next ``load_or_build``. If documents in the graph are
+gone from the inputs (an older snapshot was published), it is rebuilt.
+
+    python comentions.py --creator IShowSpeed --top 10
+"""
+
+import argparse
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+import cachefile
+import corpus
+import datastore
+from creators import CREATORS, input_file
+
+CACHE_PATH = os.path.join(".cache", "comentions.pkl")
+FORMAT_VERSION = 1
+
+# Display name -> lowercase aliases (names, nicknames and @handles)
+ENTITIES = {
+    "IShowSpeed": ["ishowspeed", "@ishowspeed", "@ishowspeedsui", "@ishowspeedhq"],
+    "MrBeast": ["mrbeast", "mr beast", "@mrbeast"],
+    "Doja Cat": ["doja cat", "dojacat", "@dojacat"],
+    "Ronaldo": ["ronaldo", "cristiano", "cr7", "@cristiano"],
+    "Messi": ["messi", "@leomessi"],
+    "Neymar": ["neymar", "@neymarjr"],
+    "Mbappé": ["mbappe", "mbappé", "@kmbappe"],
+    "Kai Cenat": ["kai cenat", "cenat", "@kaicenat"],
+    "Adin Ross": ["adin ross", "adin", "@adinross"],
+    "KSI": ["ksi", "@ksi"],
+    "Logan Paul": ["logan paul", "@loganpaul"],
+    "Jake Paul": ["jake paul", "@jakepaul"],
+    "Duke Dennis": ["duke dennis", "@thedukedennis"],
+    "Fanum": ["fanum", "@fanum"],
+    "Kevin Hart": ["kevin hart", "@kevinhart4real"],
+    "Eminem": ["eminem", "@eminem"],
+    "Drake": ["drake", "@drake"],
+}
+
+MIN_SUPPORT = 2  # documents an entity or pair needs before it is ranked
+
+_ALIASES = {alias: name for name, aliases in ENTITIES.items() for alias in aliases}
+# Longest alias first, so "kai cenat" wins over "cenat"
+_ENTITY_PATTERN = re.compile(
+    r"(?<![\w@])(?:"
+    + "|".join(re.escape(a) for a in sorted(_ALIASES, key=len, reverse=True))
+    + r")(?!\w)"
+    + r"|@\w+"
+)
+
+# Documents are every corpus source plus the creator's own tweets
+SOURCES = [*corpus.SOURCES, "tweets"]
+
+
+def extract_entities(texts):
+    """Distinct entity names per text; unknown @handles are their own entity."""
+    return [
+        sorted({_ALIASES.get(hit, hit) for hit in _ENTITY_PATTERN.findall(text)})
+        for text in pd.Series(texts, dtype=object).fillna("").astype(str).str.lower()
+    ]
+
+
+def input_files():
+    """Every input file the graph is built from."""
+    paths = [input_file(creator, source) for creator in CREATORS for source in SOURCES]
+    return [path for path in paths if datastore.exists(path)]
+
+
+def _load_documents(creator):
+    frames = []
+    for source in SOURCES:
+        path = input_file(creator, source)
+        if not datastore.exists(path):
+            continue
+        if source == "tweets":  # same layout as the public tweets
+            df = corpus.load_source("public_tweets", path)
+            df["key"] = "tweets:" + df["key"].str.split(":", n=1).str[1]
+        else:
+            df = corpus.load_source(source, path)
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=["key", "text"])
+    df = pd.concat(frames, ignore_index=True)
+    df["key"] = CREATORS[creator]["key"] + ":" + df["key"]
+    return df
+
+
+class CoMentionGraph:
+    def __init__(self):
+        from scipy import sparse
+
+        self.creators = list(CREATORS)
+        self.entities = []
+        self.entity_ids = {}
+        self.keys = set()
+        self.documents = 0  # all documents, with or without mentions
+        self.creator_documents = np.zeros(len(self.creators), dtype=np.int64)
+        self.creator_counts = sparse.csr_matrix((len(self.creators), 0), dtype=np.int64)
+        self.co_counts = sparse.csr_matrix((0, 0), dtype=np.int64)
+
+    def __len__(self):
+        return len(self.entities)
+
+    @property
+    def entity_counts(self):
+        return self.co_counts.diagonal()
+
+    @staticmethod
+    def _resize(matrix, shape):
+        from scipy import sparse
+
+        matrix = matrix.tocoo()
+        return sparse.csr_matrix(
+            (matrix.data, (matrix.row, matrix.col)), shape=shape, dtype=np.int64
+        )
+
+    # === Building ===
+    def add(self, creator, df):
+        """Add ``creator``'s documents whose key is not in the graph yet.
+
+        Returns the number of documents added.
+        """
+        from scipy import sparse
+
+        df = df[~df["key"].isin(self.keys)].drop_duplicates(subset="key")
+        if df.empty:
+            return 0
+        self.keys.update(df["key"])
+        self.documents += len(df)
+        creator_id = self.creators.index(creator)
+        self.creator_documents[creator_id] += len(df)
+
+        rows, cols = [], []
+        for row, names in enumerate(extract_entities(df["text"])):
+            for name in names:
+                if name not in self.entity_ids:
+                    self.entity_ids[name] = len(self.entities)
+                    self.entities.append(name)
+                rows.append(row)
+                cols.append(self.entity_ids[name])
+        size = len(self.entities)
+        incidence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=(len(df), size)
+        )
+
+        self.co_counts = self._resize(self.co_counts, (size, size))
+        self.co_counts = self.co_counts + (incidence.T @ incidence).tocsr()
+        mentioned = incidence.sum(axis=0).A1
+        (entity_ids,) = np.nonzero(mentioned)
+        self.creator_counts = self._resize(
+            self.creator_counts, (len(self.creators), size)
+        ) + sparse.csr_matrix(
+            (mentioned[entity_ids], (np.full(len(entity_ids), creator_id), entity_ids)),
+            shape=(len(self.creators), size),
+        )
+        return len(df)
+
+    # === Queries ===
+    def related(self, creator, n=10, min_support=MIN_SUPPORT):
+        """Entities named most often in ``creator``'s documents, with lift.
+
+        Lift compares how often the entity is named in this creator's
+        documents with how often it is named in all documents; the creator
+        themself is left out.
+        """
+        creator_id = self.creators.index(creator)
+        mentions = self.creator_counts[creator_id].toarray().ravel()
+        totals = self.entity_counts
+        keep = mentions >= min_support
+        if creator in self.entity_ids:
+            keep[self.entity_ids[creator]] = False
+        share = mentions / max(self.creator_documents[creator_id], 1)
+        lift = share / np.maximum(totals / max(self.documents, 1), 1e-12)
+        df = pd.DataFrame(
+            {
+                "Entity": self.entities,
+                "Mentions": mentions,
+                "Share": share,
+                "Lift": lift,
+            }
+        )[keep]
+        return (
+            df.sort_values(["Mentions", "Lift"], ascending=False)
+            .head(n)
+            .reset_index(drop=True)
+        )
+
+    def pairs(self, min_support=MIN_SUPPORT):
+        """Every co-mentioned pair with its count, lift and PMI."""
+        from scipy import sparse
+
+        upper = sparse.triu(self.co_counts, k=1).tocoo()
+        keep = upper.data >= min_support
+        a, b, together = upper.row[keep], upper.col[keep], upper.data[keep]
+        totals = self.entity_counts
+        lift = together * self.documents / (totals[a] * totals[b])
+        names = np.array(self.entities, dtype=object)
+        df = pd.DataFrame(
+            {
+                "Entity A": names[a],
+                "Entity B": names[b],
+                "Together": together,
+                "Lift": lift,
+                "PMI": np.log2(lift),
+            }
+        )
+        return df.sort_values(["Together", "PMI"], ascending=False, ignore_index=True)
+
+    def co_mentions(self, entity, n=10, min_support=MIN_SUPPORT):
+        """Entities named in the same documents as ``entity``, by PMI."""
+        i = self.entity_ids[entity]
+        row = self.co_counts[i].toarray().ravel()
+        totals = self.entity_counts
+        keep = row >= min_support
+        keep[i] = False
+        lift = row * self.documents / np.maximum(totals[i] * totals, 1)
+        df = pd.DataFrame(
+            {
+                "Entity": self.entities,
+                "Together": row,
+                "Lift": lift,
+                "PMI": np.log2(np.maximum(lift, 1e-12)),
+            }
+        )[keep]
+        return df.sort_values(["PMI", "Together"], ascending=False).head(n)
+
+
+def load_or_build(path=CACHE_PATH):
+    """Load the pickled graph and add any documents not yet in it."""
+    state = cachefile.load(path, FORMAT_VERSION)
+    graph = state["graph"] if state else CoMentionGraph()
+
+    documents = {creator: _load_documents(creator) for creator in CREATORS}
+    keys = set().union(*(df["key"] for df in documents.values()))
+    rebuilt = not graph.keys <= keys
+    if rebuilt:
+        graph = CoMentionGraph()
+    added = sum(graph.add(creator, df) for creator, df in documents.items())
+    if added or rebuilt:
+        cachefile.dump(path, FORMAT_VERSION, graph=graph)
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--creator", choices=list(CREATORS), default="IShowSpeed")
+    parser.add_argument("--entity", help="list co-mentions of this entity instead")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    graph = load_or_build()
+    print(f"{len(graph)} entities in {graph.documents:,} documents\n")
+    if args.entity:
+        print(graph.co_mentions(args.entity, args.top).to_string(index=False))
+    else:
+        print(graph.related(args.creator, args.top).to_string(index=False))
+
+
+if __name__ == "__main__":
+    cachefile.run_main("comentions")
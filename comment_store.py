@@ -0,0 +1,313 @@
+"""Per-video YouTube comment store with memory-mapped columns.
+
+Comments are sorted by video id and written column by column under
+``.cache/comments/<key>-<version>/``. Fixed-width columns are ``.npy`` arrays and
+strings are one UTF-8 blob plus an offsets array:
+
+    videos.npy          video ids, one per video, sorted
+    video_offsets.npy   comments of video i are rows [off[i], off[i + 1])
+    title.*             video titles, one per video
+    comment_id.*, author.*, text.*       one per comment
+    likes.npy, published.npy, score.npy, sentiment.npy
+
+Opening a store memory-maps the arrays. Looking up a video is a dict hit
+plus slices of its own rows, so the cost does not grow with the corpus.
+Each store is named after the ``datastore.table_version`` of the source
+CSV it was built from, so a changed file or another snapshot gets a store
+of its own and sessions on the old and new snapshot both keep theirs; the
+newest ``KEEP`` stores per creator are kept. A store is written to a
+temporary directory and renamed into place, and builds of one creator's
+store in a process are serialised. Sentiment is scored once, at build time.
+
+    python comment_store.py              # build every creator's store
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+import datastore
+from creators import CREATORS, input_file
+from sentiment import extract_emojis
+
+CACHE_DIR = os.path.join(".cache", "comments")
+FORMAT_VERSION = 2
+KEEP = 2  # stores kept per creator
+
+SENTIMENTS = ["positive", "neutral", "negative", "unscored"]
+
+_LIKE_SUFFIXES = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+
+_build_locks = {creator: threading.Lock() for creator in CREATORS}
+
+
+def parse_likes(values):
+    """YouTube's abbreviated like counts ("4.7K", "1.2M", "12") as integers."""
+    parts = (
+        pd.Series(values, dtype=object)
+        .astype(str)
+        .str.extract(r"^\s*([\d.,]+)\s*([KMB]?)", expand=True)
+    )
+    numbers = pd.to_numeric(parts[0].str.replace(",", ""), errors="coerce")
+    scale = parts[1].map(_LIKE_SUFFIXES).fillna(1)
+    return (numbers * scale).fillna(0).round().astype(np.int64).to_numpy()
+
+
+def _write_strings(directory, name, values):
+    encoded = [str(value).encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    with open(os.path.join(directory, f"{name}.bin"), "wb") as f:
+        f.write(b"".join(encoded))
+    np.save(os.path.join(directory, f"{name}_offsets.npy"), offsets)
+
+
+class _Strings:
+    """Memory-mapped UTF-8 blob + offsets, sliced without decoding the rest."""
+
+    def __init__(self, directory, name):
+        self.offsets = np.load(
+            os.path.join(directory, f"{name}_offsets.npy"), mmap_mode="r"
+        )
+        path = os.path.join(directory, f"{name}.bin")
+        self.blob = (
+            np.memmap(path, dtype=np.uint8, mode="r")
+            if os.path.getsize(path)
+            else np.zeros(0, dtype=np.uint8)
+        )
+
+    def slice(self, start, stop):
+        bounds = self.offsets[start : stop + 1]
+        data = self.blob[bounds[0] : bounds[-1]].tobytes()
+        base = bounds[0]
+        return [
+            data[a - base : b - base].decode("utf-8")
+            for a, b in zip(bounds[:-1], bounds[1:])
+        ]
+
+
+def store_dir(creator, source_version, cache_dir=CACHE_DIR):
+    """Directory of ``creator``'s store built from ``source_version``."""
+    tag = hashlib.sha256(str(source_version).encode()).hexdigest()[:12]
+    return os.path.join(cache_dir, f"{CREATORS[creator]['key']}-{tag}")
+
+
+def prune(creator, keep=KEEP, cache_dir=CACHE_DIR):
+    """Delete all but ``creator``'s newest ``keep`` stores.
+
+    Open stores stay readable: their files are memory-mapped.
+    """
+    key = CREATORS[creator]["key"]
+    try:
+        names = os.listdir(cache_dir)
+    except FileNotFoundError:
+        return
+    # <key> alone is the unversioned store of earlier releases
+    stores = [
+        os.path.join(cache_dir, name)
+        for name in names
+        if name == key or name.startswith(f"{key}-")
+    ]
+    stores.sort(key=os.path.getmtime, reverse=True)
+    for directory in stores[keep:]:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def build(creator, cache_dir=CACHE_DIR, backend="vader"):
+    """Write ``creator``'s store from their YouTube comment CSV."""
+    import corpus
+
+    source = input_file(creator, "youtube_comments")
+    source_version = datastore.table_version(source)
+    raw = datastore.read_csv(source).dropna(subset=["Video ID"])
+    raw["Video ID"] = raw["Video ID"].astype(str)
+    raw["Comment Text"] = raw["Comment Text"].fillna("").astype(str)
+    raw = raw.sort_values("Video ID", kind="stable").reset_index(drop=True)
+
+    scored = corpus.add_sentiment(
+        pd.DataFrame({"text": raw["Comment Text"]}),
+        backend=backend,
+    )
+    sentiment = pd.Categorical(scored["sentiment"], categories=SENTIMENTS).codes
+
+    videos, starts = np.unique(raw["Video ID"].to_numpy(dtype=str), return_index=True)
+    offsets = np.append(starts, len(raw)).astype(np.int64)
+
+    directory = store_dir(creator, source_version, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    # A directory of its own, so builds in other processes cannot collide
+    tmp = tempfile.mkdtemp(prefix=f"{CREATORS[creator]['key']}.tmp", dir=cache_dir)
+    try:
+        np.save(os.path.join(tmp, "videos.npy"), videos)
+        np.save(os.path.join(tmp, "video_offsets.npy"), offsets)
+        _write_strings(tmp, "title", raw["Video Title"].fillna("").iloc[starts])
+        _write_strings(tmp, "comment_id", raw["Comment ID"].fillna(""))
+        _write_strings(tmp, "author", raw["Author"].fillna(""))
+        _write_strings(tmp, "text", raw["Comment Text"])
+        np.save(os.path.join(tmp, "likes.npy"), parse_likes(raw["Likes"]))
+        published = corpus.parse_relative_dates(raw["Published Time"])
+        np.save(os.path.join(tmp, "published.npy"), published.to_numpy("datetime64[D]"))
+        np.save(
+            os.path.join(tmp, "score.npy"),
+            scored["sentiment_score"].to_numpy(dtype=np.float32),
+        )
+        np.save(os.path.join(tmp, "sentiment.npy"), sentiment.astype(np.int8))
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(
+                {
+                    "version": FORMAT_VERSION,
+                    "source": source,
+                    "source_version": source_version,
+                    "comments": len(raw),
+                    "videos": len(videos),
+                },
+                f,
+            )
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    # Rename the finished directory into place, so readers never see a
+    # partial store; if another process got there first, its store is the same
+    try:
+        os.rename(tmp, directory)
+    except OSError:
+        if not os.path.exists(os.path.join(directory, "meta.json")):
+            raise
+        shutil.rmtree(tmp, ignore_errors=True)
+    prune(creator, cache_dir=cache_dir)
+    return directory
+
+
+class CommentStore:
+    def __init__(self, directory):
+        def load(name):
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+
+        with open(os.path.join(directory, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.video_ids = load("videos")
+        self.offsets = load("video_offsets")
+        self.likes = load("likes")
+        self.published = load("published")
+        self.score = load("score")
+        self.sentiment = load("sentiment")
+        self.titles = _Strings(directory, "title")
+        self.comment_ids = _Strings(directory, "comment_id")
+        self.authors = _Strings(directory, "author")
+        self.texts = _Strings(directory, "text")
+        self._positions = {video: i for i, video in enumerate(self.video_ids.tolist())}
+
+    def __len__(self):
+        return int(self.meta["comments"])
+
+    def videos(self):
+        """Video id, title and comment count of every video in the store."""
+        return pd.DataFrame(
+            {
+                "Video ID": np.asarray(self.video_ids),
+                "Video Title": self.titles.slice(0, len(self.video_ids)),
+                "Comments": np.diff(self.offsets),
+            }
+        )
+
+    def _rows(self, video_id):
+        i = self._positions.get(video_id)
+        if i is None:
+            raise KeyError(video_id)
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    def title(self, video_id):
+        i = self._positions[video_id]
+        return self.titles.slice(i, i + 1)[0]
+
+    def comments(self, video_id):
+        """One video's comments, in the order they were collected."""
+        start, stop = self._rows(video_id)
+        return pd.DataFrame(
+            {
+                "Comment ID": self.comment_ids.slice(start, stop),
+                "Author": self.authors.slice(start, stop),
+                "Published": np.asarray(self.published[start:stop]),
+                "Likes": np.asarray(self.likes[start:stop]),
+                "Sentiment": np.asarray(SENTIMENTS)[self.sentiment[start:stop]],
+                "Score": np.asarray(self.score[start:stop]),
+                "Comment Text": self.texts.slice(start, stop),
+            }
+        )
+
+    def sentiment_breakdown(self, video_id):
+        """Comment count per sentiment label for one video."""
+        start, stop = self._rows(video_id)
+        counts = np.bincount(self.sentiment[start:stop], minlength=len(SENTIMENTS))
+        return pd.Series(counts, index=SENTIMENTS, name="Comments")
+
+    def top_emoji(self, video_id, n=5):
+        start, stop = self._rows(video_id)
+        texts = self.texts.slice(start, stop)
+        counts = Counter(emoji for text in texts for emoji in extract_emojis(text))
+        return pd.DataFrame(counts.most_common(n), columns=["Emoji", "Count"])
+
+
+def is_current(directory):
+    """Whether ``directory`` holds a complete store of this format."""
+    meta_path = os.path.join(directory, "meta.json")
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path) as f:
+        return json.load(f).get("version") == FORMAT_VERSION
+
+
+def open_store(creator, cache_dir=CACHE_DIR):
+    """``creator``'s store for the comment CSV ``datastore`` serves, built
+    first if there is none yet.
+
+    Concurrent calls (a viewer and the warm-up thread) build it only once.
+    """
+    source_version = datastore.table_version(input_file(creator, "youtube_comments"))
+    directory = store_dir(creator, source_version, cache_dir)
+    with _build_locks[creator]:
+        if not is_current(directory):
+            directory = build(creator, cache_dir)
+    return CommentStore(directory)
+
+
+def available_creators():
+    """Creators whose YouTube comment CSV is on disk (or in the snapshot)."""
+    return [c for c in CREATORS if datastore.exists(input_file(c, "youtube_comments"))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--creator", action="append", choices=list(CREATORS))
+    parser.add_argument(
+        "--sentiment-backend", choices=["vader", "lexicon"], default="vader"
+    )
+    args = parser.parse_args()
+
+    for creator in args.creator or available_creators():
+        started = time.perf_counter()
+        directory = build(creator, backend=args.sentiment_backend)
+        store = CommentStore(directory)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{creator}: {len(store):,} comments on {len(store.video_ids):,} videos"
+            f" in {elapsed:.2f}s"
+        )
+        video = store.video_ids[len(store.video_ids) // 2]
+        started = time.perf_counter()
+        store.comments(video), store.sentiment_breakdown(video), store.top_emoji(video)
+        print(f"  one video lookup: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Keyword-based content type tagging (from the notebook's "Classify content" cell)."""
+
+import re
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+CONTENT_TYPES = [
+    "gaming", "meme", "reaction", "music", "viral", "livestream", "country", "other",
+]  # fmt: skip
+
+content_keywords = {
+    "gaming": [
+        r"\bfifa\b", r"\bgameplay\b", r"\bstream\b", r"\bmatch\b",
+        r"\bplaystation\b", r"\bxbox\b", r"\bgoal\b", r"\bfortnite\b",
+        r"\bgaming\b", r"\bvalorant\b", r"\bwarzone\b", r"\bpro clubs\b",
+        r"\bspeed vs\b", r"\bchallenge\b", r"🎮", r"🕹️", r"🏟️",
+    ],
+    "meme": [
+        r"\bmeme\b", r"\bfunny\b", r"\bjoke\b", r"\blol\b", r"\bprank\b",
+        r"\bhilarious\b", r"\bedit\b", r"\bcompilation\b", r"\btroll\b",
+        r"😂", r"🤣", r"💀", r"😹",
+    ],
+    "reaction": [
+        r"\breact\b", r"\breaction\b", r"\bresponding\b",
+        r"\bwatch(ing)?\b", r"\bsee(ing)?\b", r"\bview(ing)?\b",
+        r"\bto (.*) (video|clip)\b", r"👀", r"😲",
+    ],
+    "music": [
+        r"\bsong\b", r"\bmusic\b", r"\bfreestyle\b", r"\brap\b",
+        r"\bbeat\b", r"\btrack\b", r"🎵", r"🎶", r"🎤", r"🎧",
+    ],
+    "viral": [
+        r"\breaking\b", r"\btrending\b", r"\bviral\b",
+        r"\bcrazy\b", r"\bwild\b", r"\bomg\b", r"\binsane\b",
+        r"🔥", r"🚨", r"📈", r"💥",
+    ],
+    "livestream": [
+        r"\blive now\b", r"\bgoing live\b", r"\blivestream\b",
+        r"\btune in\b", r"\bwatch live\b", r"🔴", r"📺",
+    ],
+    "country": [
+        r"\btravel\b", r"\btrip\b", r"\bvacation\b", r"\bexplore\b",
+        r"\bjourney\b", r"\badventure\b", r"\bpassport\b", r"\bflight\b",
+        r"\bhotel\b", r"\btour\b", r"\bdestination\b",
+        # Unicode flag emoji pattern: Regional Indicator Symbols (A-Z)
+        r"[\U0001F1E6-\U0001F1FF]{2}",
+        # Bonus travel emojis
+        r"✈️", r"🌍", r"🌎", r"🌏", r"🗺️", r"🧳", r"🏖️", r"🏝️", r"🗽", r"🗼", r"🏰", r"🕌",
+    ],
+}  # fmt: skip
+
+
+def classify_content(text):
+    if pd.isna(text):
+        return "other"
+    text = text.lower()
+    category_scores = defaultdict(int)
+    for category, patterns in content_keywords.items():
+        for pattern in patterns:
+            if re.search(pattern, text):
+                category_scores[category] += 1
+    return (
+        max(category_scores.items(), key=lambda x: x[1])[0]
+        if category_scores
+        else "other"
+    )
+
+
+def classify_series(texts):
+    """``classify_content`` for a whole column, one compiled pattern at a time."""
+    texts = ["" if pd.isna(text) else str(text).lower() for text in texts]
+    scores = np.zeros((len(texts), len(content_keywords)), dtype=np.int64)
+    for column, patterns in enumerate(content_keywords.values()):
+        for pattern in map(re.compile, patterns):
+            scores[:, column] += [pattern.search(text) is not None for text in texts]
+    # argmax keeps the first category on ties, as max() does above.
+    labels = np.array(list(content_keywords) + ["other"], dtype=object)
+    best = np.where(scores.max(axis=1) > 0, scores.argmax(axis=1), len(labels) - 1)
+    return labels[best]
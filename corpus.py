@@ -0,0 +1,231 @@
+"""Unified view of the raw text corpora (comments, tweets, posts, Reddit).
+
+Every source CSV is mapped onto the same columns so that search, dedup and
+aggregation code can treat them alike:
+
+    key        stable document id, "<source>:<native id>"
+    source     which CSV the row came from
+    platform   YouTube / Twitter / Instagram / Reddit
+    date       publish date (UTC, tz-naive)
+    text       the raw text
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+import datastore
+import dedup
+from sentiment import EMOJI_PATTERN, label_scores, score_texts
+
+# YouTube comments only carry relative times ("11 months ago"); they are
+# resolved against the date the data was collected, not today.
+COLLECTION_DATE = pd.Timestamp("2025-06-02")
+
+TWITTER_DATE_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+# source -> (csv file, platform, id column, text column, date column, date kind)
+SOURCES = {
+    "youtube_comments": (
+        "ishowspeed_top20_youtube_comments.csv",
+        "YouTube",
+        "Comment ID",
+        "Comment Text",
+        "Published Time",
+        "relative",
+    ),
+    "public_tweets": (
+        "ishowspeed_public_tweets.csv",
+        "Twitter",
+        "Tweet ID",
+        "Text",
+        "Created At",
+        "twitter",
+    ),
+    "instagram_comments": (
+        "ishowspeed_instagram_comments.csv",
+        "Instagram",
+        "Comment ID",
+        "Comment Text",
+        "Timestamp",
+        "unix",
+    ),
+    "instagram_posts": (
+        "ishowspeed_instagram_posts.csv",
+        "Instagram",
+        "Code",
+        "Post Text",
+        "Timestamp",
+        "unix",
+    ),
+    "reddit_posts": (
+        "ishowspeed_reddit_posts.csv",
+        "Reddit",
+        "Created At",
+        "Title",
+        "Created At",
+        "iso",
+    ),
+}
+
+# source -> column naming the text's author, where the source records one
+AUTHOR_COLUMNS = {"youtube_comments": "Author"}
+
+PLATFORMS = ["YouTube", "Twitter", "Instagram", "Reddit"]
+
+# Hashtags and mentions are kept whole (with their sigil) so "#speed" and
+# "speed" are different terms; emoji are single tokens.
+TOKEN_PATTERN = re.compile(
+    r"[#@]\w+|\w+|" + EMOJI_PATTERN.pattern,
+)
+
+_RELATIVE_UNITS = {
+    "hour": pd.Timedelta(hours=1),
+    "day": pd.Timedelta(days=1),
+    "week": pd.Timedelta(weeks=1),
+    "month": pd.Timedelta(days=30),
+    "year": pd.Timedelta(days=365),
+}
+
+
+def tokenize(text):
+    """Lowercased word, hashtag, mention and emoji tokens of ``text``."""
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+def parse_relative_dates(values, ref_date=COLLECTION_DATE):
+    """Vectorized "<n> <unit>(s) ago" parser for YouTube comment times."""
+    parts = (
+        pd.Series(values, dtype=object)
+        .astype(str)
+        .str.extract(r"(\d+)\s+(hour|day|week|month|year)")
+    )
+    steps = parts[1].map(_RELATIVE_UNITS)
+    counts = pd.to_numeric(parts[0], errors="coerce")
+    return (ref_date - steps * counts).dt.normalize()
+
+
+def parse_dates(values, kind):
+    values = pd.Series(values)
+    if kind == "relative":
+        return parse_relative_dates(values)
+    if kind == "unix":
+        dates = pd.to_datetime(values, unit="s", errors="coerce")
+    elif kind == "twitter":
+        dates = pd.to_datetime(values, format=TWITTER_DATE_FORMAT, errors="coerce")
+    else:
+        dates = pd.to_datetime(values, errors="coerce", utc=True)
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_convert("UTC").dt.tz_localize(None)
+    return dates
+
+
+def _unify(source, raw, authors=False):
+    _, platform, id_col, text_col, date_col, date_kind = SOURCES[source]
+    raw = raw.dropna(subset=[text_col])
+    ids = raw[id_col].astype(str)
+    df = pd.DataFrame(
+        {
+            "key": source + ":" + ids,
+            "source": source,
+            "platform": platform,
+            "date": parse_dates(raw[date_col], date_kind).to_numpy(),
+            "text": raw[text_col].astype(str).to_numpy(),
+        }
+    )
+    if authors:
+        author_col = AUTHOR_COLUMNS.get(source)
+        df["author"] = raw[author_col].to_numpy(dtype=object) if author_col else None
+    # A handful of comments were scraped twice under the same id.
+    return df.drop_duplicates(subset="key").reset_index(drop=True)
+
+
+def source_files(sources=None):
+    """The CSV of each requested source (all of them by default)."""
+    return [SOURCES[source][0] for source in (sources or SOURCES)]
+
+
+def load_source(source, path=None):
+    """Load one source CSV in the unified corpus layout."""
+    return _unify(source, datastore.read_csv(path or SOURCES[source][0]))
+
+
+def read_source_chunks(source, path=None, chunksize=10_000, authors=False):
+    """``load_source`` one chunk of ``chunksize`` CSV rows at a time.
+
+    With ``authors``, an ``author`` column is added (None for sources that
+    do not record who wrote the text). Duplicate keys are only dropped
+    within a chunk.
+    """
+    for raw in datastore.read_csv_chunks(path or SOURCES[source][0], chunksize):
+        yield _unify(source, raw, authors=authors)
+
+
+def load_corpus(sources=None):
+    """Concatenate the requested sources (all of them by default)."""
+    frames = [load_source(source) for source in (sources or SOURCES)]
+    return pd.concat(frames, ignore_index=True)
+
+
+def mark_duplicates(df):
+    """Add ``cluster`` (key of the cluster's first row) and ``multiplicity``.
+
+    Exact and near-duplicate texts (retweets, copy-pasted spam, repeated
+    comments) share a cluster; see ``dedup``.
+    """
+    df = df.copy()
+    unique, positions = dedup.collapse(df)
+    df["cluster"] = unique["key"].to_numpy()[positions]
+    df["multiplicity"] = unique["multiplicity"].to_numpy()[positions]
+    return df
+
+
+def add_sentiment(df, backend="vader"):
+    """Add ``sentiment_score`` and ``sentiment`` label columns.
+
+    Each duplicate cluster is scored once and the score is shared by all of
+    its rows. ``backend`` is "vader" (per text, as in the notebook) or
+    "lexicon" (vectorized, for bulk backfills). Rows are labelled "unscored"
+    when no sentiment backend is installed.
+    """
+    df = df.copy()
+    if "cluster" in df:
+        positions, _ = pd.factorize(df["cluster"])
+        unique = df.drop_duplicates(subset="cluster")
+    elif df.empty:
+        unique, positions = df, np.arange(0)
+    else:
+        unique, positions = dedup.collapse(df)
+    scores = score_texts(unique["text"], backend=backend)
+    if scores is None:
+        df["sentiment_score"] = float("nan")
+        df["sentiment"] = "unscored"
+    else:
+        df["sentiment_score"] = scores[positions]
+        df["sentiment"] = label_scores(scores)[positions]
+    return df
+
+
+def sentiment_summary(df, count_duplicates=False):
+    """Positive / neutral / negative counts and shares per platform.
+
+    By default each duplicate cluster counts once, so retweets and spam do
+    not skew the split. ``df`` needs the ``add_sentiment`` columns, plus
+    ``cluster`` from ``mark_duplicates`` unless ``count_duplicates`` is set.
+    """
+    if not count_duplicates:
+        df = df.drop_duplicates(subset=["platform", "cluster"])
+    counts = (
+        pd.crosstab(df["platform"], df["sentiment"])
+        .reindex(index=PLATFORMS, columns=["positive", "neutral", "negative"])
+        .fillna(0)
+        .astype(int)
+    )
+    counts.columns = ["Positive", "Neutral", "Negative"]
+    summary = counts.rename_axis("Platform").reset_index()
+    summary["Total"] = counts.sum(axis=1).to_numpy()
+    for column in ["Positive", "Neutral", "Negative"]:
+        share = summary[column] / summary["Total"].where(summary["Total"] > 0) * 100
+        summary[f"% {column}"] = share.round(1)
+    return summary
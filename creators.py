@@ -0,0 +1,73 @@
+"""Creators covered by the dashboard and where their data lives.
+
+Channel ids, handles and file prefixes used to be hard-coded in separate
+notebook cells per creator; everything creator-specific is listed here.
+"""
+
+import os
+
+CREATORS = {
+    "IShowSpeed": {
+        "key": "ishowspeed",
+        "youtube_channel_id": "UCWsDFcIhY2DBi3GB5uykGXA",
+        "twitter_username": "ishowspeedsui",
+        "twitter_user_id": "44196397",
+        "instagram_username": "ishowspeed",
+        "reddit_query": "IShowSpeed",
+        "growth_file": "ishowspeed_subscriber_growth.csv",
+    },
+    "MrBeast": {
+        "key": "mrbeast",
+        "youtube_channel_id": "UCX6OQ3DkcsbYNE6H8uQQuVA",
+        "twitter_username": "MrBeast",
+        "twitter_user_id": "2455740283",
+        "instagram_username": "MrBeast",
+        "reddit_query": "mrbeast",
+        "growth_file": "mrbeast_youtube_growth.csv",
+    },
+    "Doja Cat": {
+        "key": "dojacat",
+        "youtube_channel_id": "UCzpl23pGTHVYqvKsgY0A-_w",
+        "twitter_username": "DojaCat",
+        "twitter_user_id": "568545739",
+        "instagram_username": "dojacat",
+        "reddit_query": "dojacat",
+        "growth_file": "dojacat_subscriber_growth.csv",
+    },
+}
+
+# Column prefix of each creator in the notebook's normalized_index.csv
+INDEX_PREFIXES = {
+    "IShowSpeed": "IShowSpeed",
+    "MrBeast": "MrBeast",
+    "Doja Cat": "DojaCat",
+}
+
+# Raw inputs per creator are "<key>_<suffix>" (growth uses "growth_file")
+INPUT_SUFFIXES = {
+    "tweets": "tweets.csv",
+    "public_tweets": "public_tweets.csv",
+    "instagram_posts": "instagram_posts.csv",
+    "instagram_comments": "instagram_comments.csv",
+    "reddit_posts": "reddit_posts.csv",
+    "youtube_comments": "top20_youtube_comments.csv",
+    "youtube_videos": "all_youtube_videos.csv",
+    "followers": "followers_location.csv",
+}
+
+
+def input_file(creator, kind):
+    """Path of one of ``creator``'s raw input CSVs."""
+    config = CREATORS[creator]
+    if kind == "growth":
+        return config["growth_file"]
+    return f"{config['key']}_{INPUT_SUFFIXES[kind]}"
+
+
+# Per-creator results written by pipeline.py
+OUTPUT_DIR = "outputs"
+
+
+def output_file(creator, name, output_dir=OUTPUT_DIR):
+    """Path of one of ``creator``'s pipeline outputs, e.g. "monthly_growth.csv"."""
+    return os.path.join(output_dir, CREATORS[creator]["key"], name)
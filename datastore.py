@@ -0,0 +1,341 @@
+"""Process-wide cached data layer behind the dashboard.
+
+Everything here is cached per server process rather than per Streamlit
+session, so the warm-up thread (see ``warmup.py``) and every viewer share
+one copy.
+
+When a snapshot has been published (see ``snapshots.py``), ``read_csv``
+serves its tables instead of the loose CSVs. ``use_snapshot`` pins the
+published snapshot for the calling thread, so one Streamlit script run
+never mixes two snapshots; a file the snapshot does not hold is absent,
+even if it exists on disk. Frames are cached by table hash and survive a
+swap when their content did not change. Without a snapshot (or with
+``pin_snapshot(None)``), CSVs are re-read when their modification time
+changes.
+
+Everything derived from the data (search index, sketches, rollups, comment
+stores, change points, ...) reads through ``read_csv`` and is cached per
+``table_version`` of its input files, so it always matches the tables the
+same run reads.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import pandas as pd
+
+from creators import CREATORS, input_file, output_file
+
+# Every CSV the dashboard reads
+DASHBOARD_FILES = [
+    "youtube_view_forecast.csv",
+    "subscriber_forecast.csv",
+    "top_countries.csv",
+    "sentiment_over_time.csv",
+    "content_type_trend.csv",
+    "creator_comparison.csv",
+    "platform_freq.csv",
+    "content_trend.csv",
+    "instagram_sentiment_over_time.csv",
+    "twitter_sentiment_over_time.csv",
+    "reddit_sentiment_over_time.csv",
+    "youtube_sentiment_over_time.csv",
+    "mrbeast_tweets.csv",
+    "ishowspeed_tweets.csv",
+    "dojacat_tweets.csv",
+    "ishowspeed_followers_location.csv",
+]
+
+# Daily sentiment counts per platform, as the sentiment-over-time chart plots
+SENTIMENT_FILES = {
+    "Instagram": "instagram_sentiment_over_time.csv",
+    "Twitter": "twitter_sentiment_over_time.csv",
+    "Reddit": "reddit_sentiment_over_time.csv",
+    "YouTube": "youtube_sentiment_over_time.csv",
+}
+
+_UNPINNED = object()
+
+_lock = threading.Lock()
+_pinned = threading.local()  # .manifest: the snapshot this thread reads
+_frames = {}  # path -> (mtime or table hash, DataFrame)
+
+
+def use_snapshot():
+    """Pin the published snapshot for reads on this thread; returns it.
+
+    Call once at the start of each script run: a snapshot published
+    mid-run is picked up by the next run.
+    """
+    import snapshots
+
+    return pin_snapshot(snapshots.current())
+
+
+def pin_snapshot(manifest):
+    """Read ``manifest``'s tables on this thread; None reads the loose CSVs
+    (for ``pipeline.py``, which produces what the next snapshot holds)."""
+    _pinned.manifest = manifest
+    return manifest
+
+
+def pinned_snapshot():
+    """The manifest this thread reads, to pin in worker processes."""
+    manifest = getattr(_pinned, "manifest", _UNPINNED)
+    if manifest is _UNPINNED:
+        import snapshots
+
+        manifest = snapshots.current()
+    return manifest
+
+
+def _snapshot_table(path):
+    """Hash of ``path``'s table in the pinned (or published) snapshot: None
+    if no snapshot is read, "" if the snapshot does not hold ``path``."""
+    manifest = pinned_snapshot()
+    if manifest is None:
+        return None
+    table = manifest["tables"].get(path)
+    return table["hash"] if table else ""
+
+
+def exists(path):
+    """Whether ``read_csv(path)`` has something to read."""
+    digest = _snapshot_table(path)
+    return bool(digest) if digest is not None else os.path.exists(path)
+
+
+def table_version(path):
+    """What ``read_csv(path)`` would serve: a snapshot table hash, else the
+    file's mtime (None if there is nothing to read)."""
+    digest = _snapshot_table(path)
+    if digest is not None:
+        return digest or None
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def _missing(path):
+    manifest = pinned_snapshot()
+    return FileNotFoundError(f"{path} is not in snapshot {manifest['version']}")
+
+
+def read_csv(path):
+    """``pd.read_csv`` cached per file; returns a copy callers may modify."""
+    import snapshots
+
+    digest = _snapshot_table(path)
+    if digest == "":
+        raise _missing(path)
+    stamp = digest or os.path.getmtime(path)
+    with _lock:
+        cached = _frames.get(path)
+    if cached is None or cached[0] != stamp:
+        df = snapshots.read_table(digest) if digest else pd.read_csv(path)
+        cached = (stamp, df)
+        with _lock:
+            _frames[path] = cached
+    return cached[1].copy()
+
+
+def read_csv_chunks(path, chunksize):
+    """``read_csv(path)`` in frames of ``chunksize`` rows, read lazily from
+    the loose CSV and sliced from a snapshot's table."""
+    digest = _snapshot_table(path)
+    if digest == "":
+        raise _missing(path)
+    if digest is None:
+        yield from pd.read_csv(path, chunksize=chunksize)
+        return
+    df = read_csv(path)
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start : start + chunksize]
+
+
+def sentiment_over_time():
+    """The daily sentiment counts of every platform in one frame."""
+    df = pd.concat(
+        [read_csv(path) for path in SENTIMENT_FILES.values()], ignore_index=True
+    )
+    names = {platform.lower(): platform for platform in SENTIMENT_FILES}
+    df["platform"] = df["platform"].str.strip().str.lower().map(names)
+    return df
+
+
+def creator_output(creator, name):
+    """One of ``creator``'s ``pipeline.py`` outputs, or None if not produced."""
+    path = output_file(creator, name)
+    if exists(path):
+        return read_csv(path)
+    return None
+
+
+def twitter_engagement():
+    """Total engagement and average reply/retweet-to-like ratios per creator.
+
+    Read from ``pipeline.py``'s outputs; creators it has not been run for
+    are computed from their tweets.
+    """
+    rows = []
+    for creator in CREATORS:
+        ratios = creator_output(creator, "twitter_engagement.csv")
+        if ratios is not None:
+            rows.extend(ratios.to_dict("records"))
+            continue
+        path = input_file(creator, "tweets")
+        if not exists(path):
+            continue
+        tweets = read_csv(path)
+        # drop any rows where Likes is zero or missing, to avoid division errors
+        liked = tweets[tweets["Likes"] > 0]
+        rows.append(
+            {
+                "Creator": creator,
+                "Total Twitter Engagement": int(
+                    tweets[["Likes", "Retweets", "Replies"]].sum().sum()
+                ),
+                "Avg Replies-to-Likes Ratio": round(
+                    (liked["Replies"] / liked["Likes"]).mean(), 4
+                ),
+                "Avg Retweets-to-Likes Ratio": round(
+                    (liked["Retweets"] / liked["Likes"]).mean(), 4
+                ),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _built_from(sources, maxsize=2):
+    """Cache a builder per its arguments and the ``table_version`` of every
+    file ``sources(*args)`` lists, so a changed file or another snapshot
+    rebuilds it.
+
+    Concurrent calls with the same arguments (a viewer and the warm-up
+    thread) build it only once. Two versions are kept per arguments, for
+    sessions still on the previous snapshot.
+    """
+
+    def decorate(func):
+        lock = threading.Lock()
+        cached = {}  # args -> (lock, OrderedDict of versions -> result)
+
+        @wraps(func)
+        def wrapper(*args):
+            key = tuple(table_version(path) for path in sources(*args))
+            with lock:
+                build_lock, results = cached.setdefault(
+                    args, (threading.Lock(), OrderedDict())
+                )
+            with build_lock:
+                if key in results:
+                    results.move_to_end(key)
+                else:
+                    results[key] = func(*args)
+                    if len(results) > maxsize:
+                        results.popitem(last=False)
+                return results[key]
+
+        wrapper.cache_clear = cached.clear
+        return wrapper
+
+    return decorate
+
+
+def _corpus_files():
+    import corpus
+
+    return corpus.source_files()
+
+
+def _sketch_files():
+    import sketches
+
+    return sketches.input_files()
+
+
+def _comention_files():
+    import comentions
+
+    return comentions.input_files()
+
+
+def _growth_files():
+    import growth
+
+    return growth.source_files()
+
+
+@_built_from(lambda creator: [input_file(creator, "growth")])
+def growth_pyramid(creator):
+    """The creator's day-to-year growth rollups (see ``rollups``)."""
+    import rollups
+
+    return rollups.load(creator)
+
+
+@_built_from(lambda creator: [input_file(creator, "youtube_comments")])
+def comment_store(creator):
+    """The creator's per-video YouTube comment store (see ``comment_store``)."""
+    import comment_store as store
+
+    return store.open_store(creator)
+
+
+@_built_from(_corpus_files)
+def search_index():
+    import search
+
+    return search.load_or_build()
+
+
+@_built_from(_sketch_files)
+def corpus_sketches():
+    """Distinct-author and heavy-hitter sketches (see ``sketches``)."""
+    import sketches
+
+    return sketches.load_or_build(workers=1)
+
+
+@_built_from(_comention_files)
+def comention_graph():
+    """Who fans mention, and with whom (see ``comentions``)."""
+    import comentions
+
+    return comentions.load_or_build()
+
+
+@_built_from(_growth_files)
+def forecast_backtest():
+    """Rolling-origin forecast errors per creator, metric, model and horizon."""
+    import backtest
+
+    return backtest.backtest(workers=1)
+
+
+@_built_from(_corpus_files)
+def sentiment_summary():
+    """Duplicate-adjusted sentiment split per platform."""
+    import corpus
+
+    docs = corpus.add_sentiment(corpus.mark_duplicates(corpus.load_corpus()))
+    return corpus.sentiment_summary(docs)
+
+
+@_built_from(lambda: list(SENTIMENT_FILES.values()))
+def _sentiment_events():
+    import changepoints
+
+    return changepoints.detect_events()
+
+
+def sentiment_events():
+    """Detected shifts in daily sentiment per platform (see ``changepoints``).
+
+    Only days appended to the sentiment files since the last call are
+    segmented.
+    """
+    return _sentiment_events().copy()
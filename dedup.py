@@ -0,0 +1,159 @@
+"""Exact and near-duplicate detection with MinHash signatures and LSH banding.
+
+Retweets ("RT @user: ..."), copy-pasted spam and repeated comments such as
+"f4f" would otherwise be scored and counted once per copy. Texts are first
+normalized and grouped exactly; the remaining unique texts get a MinHash
+signature over character shingles, and LSH banding proposes candidate
+near-duplicates without comparing every pair. Candidates whose estimated
+Jaccard similarity clears ``threshold`` are merged into one cluster.
+
+    python dedup.py
+"""
+
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+NUM_PERM = 64
+BANDS = 8  # 8 bands x 8 rows: pairs above ~0.77 Jaccard are very likely caught
+SHINGLE_SIZE = 5
+THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_RETWEET = re.compile(r"^rt @\w+:?\s*")
+_URL = re.compile(r"https?://\S+")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize(texts):
+    """Lowercase, drop the retweet prefix and links, squeeze whitespace."""
+    texts = pd.Series(texts, dtype=object).fillna("").astype(str).str.lower()
+    stripped = texts.str.replace(_RETWEET, "", regex=True)
+    stripped = stripped.str.replace(_URL, "", regex=True)
+    stripped = stripped.str.replace(_SPACE, " ", regex=True).str.strip()
+    # Link-only texts would all collapse to ""; keep those as they were.
+    return stripped.where(stripped != "", texts)
+
+
+def _shingle_hashes(text, k=SHINGLE_SIZE):
+    if len(text) <= k:
+        shingles = {text}
+    else:
+        shingles = {text[i : i + k] for i in range(len(text) - k + 1)}
+    return [zlib.crc32(s.encode("utf-8")) for s in shingles]
+
+
+def minhash_signatures(texts, num_perm=NUM_PERM, seed=1, chunk_size=200_000):
+    """MinHash signatures, one row of ``num_perm`` uint32 values per text.
+
+    Shingle hashes are CRC32, so signatures are stable across processes and
+    can be computed on separate chunks and compared later.
+    """
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)[:, None]
+    b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)[:, None]
+
+    hashes = [_shingle_hashes(t) for t in texts]
+    lengths = np.array([len(h) for h in hashes], dtype=np.int64)
+    flat = np.fromiter(
+        (h for doc in hashes for h in doc), dtype=np.uint64, count=lengths.sum()
+    )
+    owner = np.repeat(np.arange(len(hashes)), lengths)
+
+    signatures = np.full((len(hashes), num_perm), _MAX_HASH, dtype=np.uint64)
+    # Permute shingle hashes in chunks to bound the (num_perm x shingles) matrix.
+    for start in range(0, len(flat), chunk_size):
+        chunk = flat[start : start + chunk_size]
+        permuted = ((a * chunk + b) % _MERSENNE_PRIME) & _MAX_HASH
+        docs = owner[start : start + chunk_size]
+        bounds = np.flatnonzero(np.r_[True, docs[1:] != docs[:-1]])
+        mins = np.minimum.reduceat(permuted, bounds, axis=1).T
+        rows = docs[bounds]
+        signatures[rows] = np.minimum(signatures[rows], mins)
+    return signatures.astype(np.uint32)
+
+
+def lsh_clusters(signatures, bands=BANDS, threshold=THRESHOLD):
+    """Cluster labels for signature rows whose estimated Jaccard >= threshold.
+
+    Within each band, rows that hash to the same bucket are compared with the
+    bucket's first row only, so the work stays linear in the number of rows.
+    """
+    n, num_perm = signatures.shape
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    rows = num_perm // bands
+    parent = np.arange(n)
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[:, band * rows : (band + 1) * rows])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+        _, bucket = np.unique(keys, return_inverse=True)
+        order = np.argsort(bucket, kind="stable")
+        sorted_buckets = bucket[order]
+        starts = np.flatnonzero(np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]])
+        heads = np.repeat(order[starts], np.diff(np.r_[starts, n]))
+        pairs = heads != order
+        if not pairs.any():
+            continue
+        left, right = heads[pairs], order[pairs]
+        similarity = (signatures[left] == signatures[right]).mean(axis=1)
+        for i, j in zip(left[similarity >= threshold], right[similarity >= threshold]):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    return np.array([find(i) for i in range(n)])
+
+
+def find_duplicates(texts, threshold=THRESHOLD):
+    """Cluster label per text; exact and near-duplicates share a label.
+
+    A label is the position of the cluster's first text in ``texts``.
+    """
+    normalized = normalize(texts)
+    exact, uniques = pd.factorize(normalized)
+    first_position = np.full(len(uniques), len(exact), dtype=np.int64)
+    np.minimum.at(first_position, exact, np.arange(len(exact)))
+
+    near = lsh_clusters(minhash_signatures(uniques), threshold=threshold)
+    return first_position[near][exact]
+
+
+def collapse(df, text_column="text", threshold=THRESHOLD):
+    """One row per duplicate cluster, with a ``multiplicity`` column.
+
+    Also returns each input row's position in the collapsed frame so that
+    per-cluster results can be broadcast back with ``values[positions]``.
+    """
+    labels = find_duplicates(df[text_column], threshold=threshold)
+    representatives, positions = np.unique(labels, return_inverse=True)
+    unique = df.iloc[representatives].copy()
+    unique["multiplicity"] = np.bincount(positions)
+    return unique, positions
+
+
+def main():
+    import corpus
+
+    docs = corpus.load_corpus()
+    for source, group in docs.groupby("source"):
+        unique, _ = collapse(group)
+        print(f"{source}: {len(group):,} texts -> {len(unique):,} clusters")
+        top = unique.nlargest(3, "multiplicity")
+        for text, count in zip(top["text"], top["multiplicity"]):
+            print(f"    x{count:<4} {text[:70]!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""Linear trend forecasts (the notebook's LinearRegression-on-ordinal-date models)."""
+
+import numpy as np
+import pandas as pd
+
+
+def to_ordinals(dates):
+    """Proleptic Gregorian ordinals, as ``datetime.toordinal`` returns."""
+    days = pd.DatetimeIndex(dates).values.astype("datetime64[D]").astype(np.int64)
+    return days + 719163  # ordinal of 1970-01-01
+
+
+def fit_linear_trend(dates, values):
+    """Least-squares ``(slope, intercept)`` of ``values`` on date ordinals."""
+    slope, intercept = np.polyfit(to_ordinals(dates), np.asarray(values, float), 1)
+    return slope, intercept
+
+
+def linear_trend_forecast(dates, values, future_dates):
+    """Predict ``values`` at ``future_dates`` from a straight-line fit."""
+    slope, intercept = fit_linear_trend(dates, values)
+    return slope * to_ordinals(future_dates) + intercept
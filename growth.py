@@ -0,0 +1,112 @@
+"""Normalized growth index computed on the fly with a selectable baseline.
+
+Each creator's cumulative subscriber or view total is aligned into one
+date x creator matrix; the index for a baseline date is that matrix divided
+by its baseline row (minus one for views, matching the notebook's
+"Normalized Total Views Growth", which starts at 0). The matrix is built
+once per (creators, metric) and each rebased index is cached per
+(creators, baseline, metric), so moving the baseline is a single vectorized
+division. Both caches are keyed on the versions of the files read (see
+``datastore.table_version``), so changed data is picked up on the next call.
+
+Creators without a raw ``*_growth.csv`` on disk fall back to the levels
+recorded in the notebook's ``normalized_index.csv``. Those are relative to
+2022-06-04 rather than absolute, which does not change a rebased index.
+"""
+
+from functools import lru_cache
+
+import pandas as pd
+
+import datastore
+from creators import CREATORS, INDEX_PREFIXES
+
+NORMALIZED_INDEX_FILE = "normalized_index.csv"
+DEFAULT_BASELINE = "2022-06-04"
+
+# metric -> (raw growth column, normalized_index.csv suffix, index offset)
+METRICS = {
+    "subscribers": ("Total Subscribers", "_Sub", 0.0),
+    "views": ("Total Views", "_View", 1.0),
+}
+
+
+def _read_days(values):
+    days = pd.to_datetime(values, utc=True).dt.tz_localize(None)
+    return days.dt.normalize()
+
+
+def _source(creator):
+    """The file ``creator``'s levels are read from."""
+    growth_file = CREATORS[creator]["growth_file"]
+    if datastore.table_version(growth_file) is not None:
+        return growth_file
+    return NORMALIZED_INDEX_FILE
+
+
+def source_files(creators=CREATORS):
+    """The files the levels of ``creators`` are read from."""
+    return [_source(creator) for creator in creators]
+
+
+def _versions(creators):
+    return tuple(datastore.table_version(_source(creator)) for creator in creators)
+
+
+def load_creator_levels(creator, metric):
+    """Daily cumulative level of ``metric`` for one creator."""
+    column, suffix, offset = METRICS[metric]
+    path = _source(creator)
+    df = datastore.read_csv(path)
+    if path == NORMALIZED_INDEX_FILE:
+        levels = df[INDEX_PREFIXES[creator] + suffix].to_numpy(dtype=float) + offset
+    else:
+        levels = df[column].to_numpy(dtype=float)
+    series = pd.Series(levels, index=_read_days(df["Day"]), name=creator)
+    return series[~series.index.duplicated(keep="last")].sort_index()
+
+
+def growth_matrix(creators, metric):
+    """Aligned date x creator matrix of cumulative levels.
+
+    Cumulative totals only move forward, so days missing for one creator
+    are filled with that creator's previous value.
+    """
+    creators = tuple(creators)
+    return _growth_matrix(creators, metric, _versions(creators))
+
+
+@lru_cache(maxsize=16)
+def _growth_matrix(creators, metric, versions):
+    series = [load_creator_levels(creator, metric) for creator in creators]
+    return pd.concat(series, axis=1).sort_index().ffill()
+
+
+def normalized_index(creators, baseline=DEFAULT_BASELINE, metric="subscribers"):
+    """Growth index of each creator relative to ``baseline``, from then on.
+
+    ``creators`` is a tuple of names from ``CREATORS``. The baseline row is
+    the first day on or after ``baseline`` for which each creator has data.
+    """
+    creators = tuple(creators)
+    return _normalized_index(creators, baseline, metric, _versions(creators))
+
+
+@lru_cache(maxsize=64)
+def _normalized_index(creators, baseline, metric, versions):
+    _, _, offset = METRICS[metric]
+    matrix = _growth_matrix(creators, metric, versions)
+    matrix = matrix.loc[pd.Timestamp(baseline) :]
+    base = matrix.bfill().iloc[0]
+    return matrix.div(base, axis=1) - offset
+
+
+def date_range(creators, metric="subscribers"):
+    """First and last day covered by the aligned matrix."""
+    matrix = growth_matrix(tuple(creators), metric)
+    return matrix.index.min(), matrix.index.max()
+
+
+def clear_cache():
+    _growth_matrix.cache_clear()
+    _normalized_index.cache_clear()
@@ -0,0 +1,167 @@
+"""On-disk cache of API responses for the collectors, with offline replay.
+
+A request is identified by its method, URL and normalized query parameters
+(values as strings, sorted by name, credentials left out). Under
+``.cache/http/``:
+
+    entries/<request hash>.json   URL, parameters, validators, fetch time
+    bodies/<body hash>            response body, stored once per content
+
+Bodies are content-addressed, so pages that come back unchanged are stored
+once however often they are fetched.
+
+Modes:
+
+    online    serve entries younger than ``max_age`` from disk; revalidate
+              older ones with If-None-Match / If-Modified-Since when the
+              API sent an ETag or Last-Modified, else download again
+    refresh   revalidate or download every request
+    offline   never touch the network; a request that is not cached
+              raises ``CacheMiss``
+"""
+
+import hashlib
+import json
+import os
+import time
+
+CACHE_DIR = os.path.join(".cache", "http")
+MODES = ["online", "refresh", "offline"]
+DEFAULT_MAX_AGE = 24 * 60 * 60  # seconds
+
+# Query parameters that carry credentials rather than select data
+SECRET_PARAMS = {"key", "api_key", "access_token"}
+
+
+class CacheMiss(LookupError):
+    """An offline request has no cached response."""
+
+
+class CachedResponse:
+    """The parts of ``requests.Response`` the collectors use."""
+
+    def __init__(self, status_code, content, from_cache):
+        self.status_code = status_code
+        self.content = content
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def request_key(url, params=None, method="GET"):
+    """Hash of the request, independent of parameter order and credentials."""
+    params = {
+        str(name): str(value)
+        for name, value in (params or {}).items()
+        if value is not None and name not in SECRET_PARAMS
+    }
+    canonical = json.dumps(
+        [method.upper(), url.rstrip("/"), sorted(params.items())],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ResponseCache:
+    def __init__(self, root=CACHE_DIR, mode="online", max_age=DEFAULT_MAX_AGE):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, not {mode!r}")
+        self.root = root
+        self.mode = mode
+        self.max_age = max_age
+        self.stats = {"hits": 0, "revalidated": 0, "downloaded": 0}
+        self._session = None
+        for sub in ("entries", "bodies"):
+            os.makedirs(os.path.join(root, sub), exist_ok=True)
+
+    def _entry_path(self, key):
+        return os.path.join(self.root, "entries", f"{key}.json")
+
+    def _body_path(self, digest):
+        return os.path.join(self.root, "bodies", digest)
+
+    def _load(self, key):
+        try:
+            with open(self._entry_path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+            with open(self._body_path(entry["body"]), "rb") as f:
+                return entry, f.read()
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None, None
+
+    def _store(self, key, url, params, response, content):
+        digest = hashlib.sha256(content).hexdigest()
+        if not os.path.exists(self._body_path(digest)):
+            _write_atomic(self._body_path(digest), content)
+        entry = {
+            "url": url,
+            "params": {k: v for k, v in params.items() if k not in SECRET_PARAMS},
+            "status": response.status_code,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "body": digest,
+        }
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        _write_atomic(self._entry_path(key), data)
+        return entry
+
+    def _touch(self, key, entry):
+        entry["fetched_at"] = time.time()
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        _write_atomic(self._entry_path(key), data)
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+        return self._session
+
+    def get(self, url, params=None, headers=None):
+        """GET ``url`` through the cache; only 200 responses are stored."""
+        params = dict(params or {})
+        key = request_key(url, params)
+        entry, content = self._load(key)
+
+        if self.mode == "offline":
+            if entry is None:
+                raise CacheMiss(f"not cached: {url} {params}")
+            self.stats["hits"] += 1
+            return CachedResponse(entry["status"], content, from_cache=True)
+
+        if entry is not None and self.mode == "online":
+            if time.time() - entry["fetched_at"] < self.max_age:
+                self.stats["hits"] += 1
+                return CachedResponse(entry["status"], content, from_cache=True)
+
+        headers = dict(headers or {})
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.session.get(url, params=params, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self._touch(key, entry)
+            self.stats["revalidated"] += 1
+            return CachedResponse(entry["status"], content, from_cache=True)
+
+        self.stats["downloaded"] += 1
+        if response.status_code == 200:
+            self._store(key, url, params, response, response.content)
+        return CachedResponse(response.status_code, response.content, from_cache=False)
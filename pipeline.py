@@ -0,0 +1,413 @@
+"""Run the per-creator analysis stages for any number of creators in parallel.
+
+The notebook repeats its collect-and-analyze cells once per creator. Here
+each analysis is a stage function, and every (creator, stage) pair is a
+task on a process pool; a stage starts as soon as the stages it depends on
+have finished for that creator. Results go to ``outputs/<key>/*.csv`` (see
+``creators.output_file``), where the dashboard picks them up.
+
+    python pipeline.py                              # every creator, every stage
+    python pipeline.py --creator MrBeast --stage growth --stage forecast
+
+A stage whose raw inputs are missing for a creator is reported as skipped,
+and one that raises as failed; the stages that depend on either are skipped.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+import content
+import forecast
+from creators import CREATORS, input_file, output_file
+
+FORECAST_MONTHS = 12
+
+# Sources the notebook ran sentiment analysis on
+SENTIMENT_SOURCES = [
+    "youtube_comments",
+    "public_tweets",
+    "instagram_comments",
+    "reddit_posts",
+]
+
+# Every file a creator's stages write, in stage order
+OUTPUT_NAMES = [
+    "monthly_growth.csv",
+    "quarterly_growth.csv",
+    "sentiment_over_time.csv",
+    "sentiment_summary.csv",
+    "content_tagged_posts.csv",
+    "content_type_trend.csv",
+    "engagement_by_content_type.csv",
+    "twitter_engagement.csv",
+    "subscriber_forecast.csv",
+    "view_forecast.csv",
+    "forecast_backtest.csv",
+    "normalized_index.csv",
+]
+
+ENGAGEMENT_COLUMNS = ["Likes", "Comments", "Replies", "Retweets", "Views"]
+
+
+class MissingInput(FileNotFoundError):
+    """A raw input CSV a stage needs is not on disk."""
+
+
+def _read_input(creator, kind):
+    path = input_file(creator, kind)
+    if not os.path.exists(path):
+        raise MissingInput(f"missing {path}")
+    return pd.read_csv(path)
+
+
+def _write(df, creator, name, output_dir):
+    path = output_file(creator, name, output_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.to_csv(path, index=False)
+    return path
+
+
+def _growth_frame(creator):
+    df = _read_input(creator, "growth")
+    df["Day"] = pd.to_datetime(df["Day"], utc=True).dt.tz_localize(None)
+    return df.sort_values("Day")
+
+
+def run_growth(creator, output_dir):
+    """Monthly and quarterly subscriber/view gains with spike flags."""
+    import rollups
+
+    if not os.path.exists(input_file(creator, "growth")):
+        raise MissingInput(f"missing {input_file(creator, 'growth')}")
+    pyramid = rollups.load(creator)
+    written = []
+    for level, freq, name in [
+        ("Month", "M", "monthly_growth.csv"),
+        ("Quarter", "Q", "quarterly_growth.csv"),
+    ]:
+        gains = pyramid.level(level)
+        gains[level] = gains[level].dt.to_period(freq).astype(str)
+        written.append(_write(gains, creator, name, output_dir))
+    return written
+
+
+def run_sentiment(creator, output_dir, backend="vader"):
+    """Daily sentiment counts per platform and the duplicate-adjusted split."""
+    import corpus
+
+    frames = [
+        corpus.load_source(source, input_file(creator, source))
+        for source in SENTIMENT_SOURCES
+        if os.path.exists(input_file(creator, source))
+    ]
+    if not frames:
+        raise MissingInput(f"no text corpora for {creator}")
+    docs = corpus.mark_duplicates(pd.concat(frames, ignore_index=True))
+    docs = corpus.add_sentiment(docs, backend=backend)
+
+    daily = (
+        pd.crosstab(
+            [docs["date"].dt.strftime("%Y-%m-%d").rename("Date"), docs["platform"]],
+            docs["sentiment"],
+        )
+        .reindex(columns=["negative", "neutral", "positive"], fill_value=0)
+        .reset_index()
+    )
+    daily["net_sentiment"] = daily["positive"] - daily["negative"]
+    daily = daily[
+        ["Date", "negative", "neutral", "positive", "net_sentiment", "platform"]
+    ]
+    return [
+        _write(daily, creator, "sentiment_over_time.csv", output_dir),
+        _write(
+            corpus.sentiment_summary(docs),
+            creator,
+            "sentiment_summary.csv",
+            output_dir,
+        ),
+    ]
+
+
+def run_content(creator, output_dir):
+    """Tag tweets and Instagram posts with a content type."""
+    import corpus
+
+    frames = []
+    for kind, platform, text_col, date_col, date_kind in [
+        ("tweets", "Twitter", "Text", "Created At", "twitter"),
+        ("instagram_posts", "Instagram", "Post Text", "Timestamp", "unix"),
+    ]:
+        try:
+            raw = _read_input(creator, kind)
+        except MissingInput:
+            continue
+        posts = raw.reindex(columns=ENGAGEMENT_COLUMNS)
+        posts.insert(0, "platform", platform)
+        posts.insert(1, "date", corpus.parse_dates(raw[date_col], date_kind))
+        posts.insert(2, "content_type", content.classify_series(raw[text_col]))
+        frames.append(posts)
+    if not frames:
+        raise MissingInput(f"no posts for {creator}")
+    posts = pd.concat(frames, ignore_index=True)
+    posts["month"] = posts["date"].dt.strftime("%Y-%m")
+
+    trend = (
+        posts.groupby(["month", "content_type", "platform"])
+        .size()
+        .rename("count")
+        .reset_index()[["month", "content_type", "count", "platform"]]
+    )
+    return [
+        _write(posts, creator, "content_tagged_posts.csv", output_dir),
+        _write(trend, creator, "content_type_trend.csv", output_dir),
+    ]
+
+
+def run_engagement(creator, output_dir):
+    """Average engagement per content type and Twitter engagement ratios."""
+    posts = pd.read_csv(output_file(creator, "content_tagged_posts.csv", output_dir))
+    stats = posts.groupby(["platform", "content_type"])[ENGAGEMENT_COLUMNS].mean()
+    stats["Like/View %"] = stats["Likes"] / stats["Views"] * 100
+    stats["Comment/Like %"] = stats["Comments"] / stats["Likes"] * 100
+    written = [
+        _write(
+            stats.round(2).reset_index(),
+            creator,
+            "engagement_by_content_type.csv",
+            output_dir,
+        )
+    ]
+
+    tweets = posts[posts["platform"] == "Twitter"]
+    liked = tweets[tweets["Likes"] > 0]
+    if not tweets.empty:
+        ratios = pd.DataFrame(
+            {
+                "Creator": [creator],
+                "Total Twitter Engagement": [
+                    int(tweets[["Likes", "Retweets", "Replies"]].sum().sum())
+                ],
+                "Avg Replies-to-Likes Ratio": [
+                    round((liked["Replies"] / liked["Likes"]).mean(), 4)
+                ],
+                "Avg Retweets-to-Likes Ratio": [
+                    round((liked["Retweets"] / liked["Likes"]).mean(), 4)
+                ],
+            }
+        )
+        written.append(_write(ratios, creator, "twitter_engagement.csv", output_dir))
+    return written
+
+
+def run_forecast(creator, output_dir):
+    """Linear-trend subscriber and monthly view forecasts, 12 months ahead."""
+    df = _growth_frame(creator)
+    monthly = (
+        df.set_index("Day")
+        .resample("ME")
+        .agg({"Total Subscribers": "last", "Views Gained": "sum"})
+    )
+    last_month = monthly.index[-1]
+    future = pd.date_range(last_month, periods=FORECAST_MONTHS + 1, freq="ME")[1:]
+    dates = monthly.index.append(future)
+
+    subs = pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Subscribers": monthly["Total Subscribers"].reindex(dates).to_numpy(),
+            "Predicted Subscribers": forecast.linear_trend_forecast(
+                monthly.index, monthly["Total Subscribers"], dates
+            ).round(),
+        }
+    )
+    views = pd.DataFrame(
+        {
+            "Month": dates.strftime("%Y-%m"),
+            "Views Gained": monthly["Views Gained"].reindex(dates).to_numpy(),
+            "Predicted Views": forecast.linear_trend_forecast(
+                monthly.index, monthly["Views Gained"], dates
+            ).round(),
+        }
+    )
+    return [
+        _write(subs, creator, "subscriber_forecast.csv", output_dir),
+        _write(views, creator, "view_forecast.csv", output_dir),
+    ]
+
+
+def run_backtest(creator, output_dir):
+    """Rolling-origin errors and interval coverage of the forecast models."""
+    import backtest
+
+    # growth.load_creator_levels would fall back to the notebook's index
+    if not os.path.exists(input_file(creator, "growth")):
+        raise MissingInput(f"missing {input_file(creator, 'growth')}")
+    results = backtest.backtest([creator], workers=1)
+    return [_write(results, creator, "forecast_backtest.csv", output_dir)]
+
+
+def run_normalization(creator, output_dir):
+    """Subscriber and view index relative to the creator's first day."""
+    import growth
+
+    # growth.load_creator_levels would fall back to the notebook's index
+    if not os.path.exists(input_file(creator, "growth")):
+        raise MissingInput(f"missing {input_file(creator, 'growth')}")
+    levels = pd.concat(
+        [growth.load_creator_levels(creator, metric) for metric in growth.METRICS],
+        axis=1,
+        keys=list(growth.METRICS),
+    )
+    base = levels.iloc[0]
+    index = pd.DataFrame(
+        {
+            "Day": levels.index.strftime("%Y-%m-%d"),
+            "Subscriber Index": (
+                levels["subscribers"] / base["subscribers"]
+            ).to_numpy(),
+            "View Index": (levels["views"] / base["views"] - 1).to_numpy(),
+        }
+    )
+    return [_write(index, creator, "normalized_index.csv", output_dir)]
+
+
+# stage -> (function, stages it depends on)
+STAGES = {
+    "growth": (run_growth, []),
+    "sentiment": (run_sentiment, []),
+    "content": (run_content, []),
+    "engagement": (run_engagement, ["content"]),
+    "forecast": (run_forecast, []),
+    "backtest": (run_backtest, []),
+    "normalization": (run_normalization, []),
+}
+
+
+def _run_task(creator, stage, output_dir, options):
+    import datastore
+
+    # Produce the next snapshot's outputs from the CSVs on disk
+    datastore.pin_snapshot(None)
+    func, _ = STAGES[stage]
+    kwargs = {"backend": options["sentiment_backend"]} if stage == "sentiment" else {}
+    started = time.perf_counter()
+    try:
+        written = func(creator, output_dir, **kwargs)
+        status = "ok"
+    except MissingInput as e:
+        written, status = [], f"skipped: {e}"
+    except Exception as e:  # one failed stage must not stop the run
+        written, status = [], f"failed: {e!r}"
+    return {
+        "Creator": creator,
+        "Stage": stage,
+        "Status": status,
+        "Seconds": round(time.perf_counter() - started, 3),
+        "Outputs": len(written),
+    }
+
+
+def _with_dependencies(stages):
+    needed = []
+    for stage in stages:
+        for dependency in STAGES[stage][1]:
+            needed.extend(
+                d for d in _with_dependencies([dependency]) if d not in needed
+            )
+        if stage not in needed:
+            needed.append(stage)
+    return needed
+
+
+def run(
+    creators=None, stages=None, output_dir=None, workers=None, sentiment_backend="vader"
+):
+    """Run ``stages`` for ``creators`` on a process pool.
+
+    Defaults to every creator and every stage. Returns one report row per
+    (creator, stage) in completion order.
+    """
+    from creators import OUTPUT_DIR
+
+    creators = list(creators or CREATORS)
+    stages = _with_dependencies(stages or list(STAGES))
+    output_dir = output_dir or OUTPUT_DIR
+    options = {"sentiment_backend": sentiment_backend}
+
+    waiting = {(creator, stage) for creator in creators for stage in stages}
+    done = {}  # (creator, stage) -> status
+    report = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while waiting or running:
+            for task in sorted(waiting):
+                creator, stage = task
+                deps = [done.get((creator, d)) for d in STAGES[stage][1]]
+                if any(status is None for status in deps):
+                    continue
+                waiting.discard(task)
+                if all(status == "ok" for status in deps):
+                    future = pool.submit(_run_task, creator, stage, output_dir, options)
+                    running[future] = task
+                else:
+                    done[task] = "skipped"
+                    report.append(
+                        {
+                            "Creator": creator,
+                            "Stage": stage,
+                            "Status": "skipped: dependency did not run",
+                            "Seconds": 0.0,
+                            "Outputs": 0,
+                        }
+                    )
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                task = running.pop(future)
+                try:
+                    row = future.result()
+                except Exception as e:  # the worker process itself died
+                    creator, stage = task
+                    row = {
+                        "Creator": creator,
+                        "Stage": stage,
+                        "Status": f"failed: {e!r}",
+                        "Seconds": 0.0,
+                        "Outputs": 0,
+                    }
+                done[task] = row["Status"]
+                report.append(row)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--creator", action="append", choices=list(CREATORS))
+    parser.add_argument("--stage", action="append", choices=list(STAGES))
+    parser.add_argument("--output-dir")
+    parser.add_argument("--workers", type=int, help="default: one per CPU")
+    parser.add_argument(
+        "--sentiment-backend", choices=["vader", "lexicon"], default="vader"
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    report = run(
+        args.creator,
+        args.stage,
+        args.output_dir,
+        args.workers,
+        args.sentiment_backend,
+    )
+    pd.set_option("display.width", 160)
+    print(pd.DataFrame(report).to_string(index=False))
+    print(f"\n{len(report)} tasks in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
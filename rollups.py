@@ -0,0 +1,126 @@
+"""Pre-aggregated day / week / month / quarter / year growth rollups.
+
+Each creator's daily ``Subscribers Gained`` and ``Views Gained`` are summed
+into one table per level, with the 2-standard-deviation spike flags the
+Growth tab overlays. Switching granularity is then a lookup.
+
+Rollups are pickled to ``.cache/rollups/<key>.pkl`` next to the version
+(``datastore.table_version``) of the growth CSV they were built from. When
+the CSV changes, only days after the last rolled-up day are added to each
+level. If the history starts on a different day, ends earlier, or a day
+already rolled up changed, everything is rebuilt.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+import cachefile
+import datastore
+from creators import CREATORS, input_file
+
+CACHE_DIR = os.path.join(".cache", "rollups")
+FORMAT_VERSION = 2
+
+# level -> pandas period frequency
+LEVELS = {"Day": "D", "Week": "W", "Month": "M", "Quarter": "Q", "Year": "Y"}
+ADVERBS = {
+    "Day": "Daily",
+    "Week": "Weekly",
+    "Month": "Monthly",
+    "Quarter": "Quarterly",
+    "Year": "Yearly",
+}
+
+GAIN_COLUMNS = ["Subscribers Gained", "Views Gained"]
+SPIKE_COLUMNS = {"Subscribers Gained": "Sub Spike", "Views Gained": "View Spike"}
+
+
+def daily_gains(df):
+    """Gains per calendar day (UTC) from a raw growth CSV frame."""
+    days = pd.to_datetime(df["Day"], utc=True).dt.tz_localize(None).dt.normalize()
+    return df[GAIN_COLUMNS].groupby(days.rename("Day")).sum().sort_index()
+
+
+class GrowthPyramid:
+    def __init__(self):
+        self.first_day = None
+        self.last_day = None
+        self.tables = {
+            level: pd.DataFrame(columns=GAIN_COLUMNS, dtype="int64") for level in LEVELS
+        }
+        self._views = {}
+
+    def __len__(self):
+        return len(self.tables["Day"])
+
+    def update(self, daily):
+        """Roll the days of ``daily`` after ``last_day`` into every level.
+
+        ``daily`` is indexed by day, as ``daily_gains`` returns. Returns the
+        number of days added.
+        """
+        new = daily if self.last_day is None else daily[daily.index > self.last_day]
+        if new.empty:
+            return 0
+        if self.first_day is None:
+            self.first_day = new.index[0]
+        self.last_day = new.index[-1]
+        for level, freq in LEVELS.items():
+            rolled = new.groupby(new.index.to_period(freq).start_time).sum()
+            table = self.tables[level].add(rolled, fill_value=0)
+            self.tables[level] = table.astype("int64").sort_index()
+        self._views.clear()
+        return len(new)
+
+    def matches(self, daily):
+        """Whether ``daily`` extends the rolled-up history without rewriting it."""
+        if self.first_day is None or daily.empty:
+            return self.first_day is None
+        if daily.index[0] != self.first_day or daily.index[-1] < self.last_day:
+            return False
+        known = daily[daily.index <= self.last_day]
+        rolled = self.tables["Day"].reindex(known.index)
+        return np.array_equal(known.to_numpy(), rolled.to_numpy())
+
+    def level(self, level):
+        """Gains per period of ``level`` with spike flags, oldest first."""
+        if level not in self._views:
+            table = self.tables[level].copy()
+            for column, flag in SPIKE_COLUMNS.items():
+                threshold = table[column].mean() + 2 * table[column].std()
+                table[flag] = table[column] > threshold
+            self._views[level] = table.rename_axis(level).reset_index()
+        return self._views[level].copy()
+
+
+def _cache_path(creator, cache_dir):
+    return os.path.join(cache_dir, f"{CREATORS[creator]['key']}.pkl")
+
+
+def load(creator, cache_dir=CACHE_DIR):
+    """The creator's rollups, brought up to date with their growth CSV."""
+    path = input_file(creator, "growth")
+    source_version = datastore.table_version(path)
+    cache_path = _cache_path(creator, cache_dir)
+
+    pyramid = None
+    state = cachefile.load(cache_path, FORMAT_VERSION)
+    if state:
+        if state["source"] == source_version:
+            return state["pyramid"]
+        pyramid = state["pyramid"]
+
+    daily = daily_gains(datastore.read_csv(path))
+    if pyramid is None or not pyramid.matches(daily):
+        pyramid = GrowthPyramid()
+    pyramid.update(daily)
+
+    cachefile.dump(cache_path, FORMAT_VERSION, source=source_version, pyramid=pyramid)
+    return pyramid
+
+
+def available_creators():
+    """Creators whose raw growth CSV is on disk (or in the snapshot)."""
+    return [c for c in CREATORS if datastore.exists(input_file(c, "growth"))]
@@ -0,0 +1,252 @@
+"""Persistent inverted index over the comment, tweet, post and Reddit corpora.
+
+Postings are kept per term as two numpy arrays (document ids and term
+frequencies), so a query touches only the documents that contain its terms
+and ranks them with BM25. Platform, date and sentiment filters are applied
+as boolean masks over per-document arrays.
+
+The index is pickled to ``.cache/search_index.pkl`` and updated in place:
+``load_or_build`` only tokenizes and scores documents whose key is not
+already indexed. If indexed documents are gone from the corpus (an older
+snapshot was published), the index is rebuilt.
+
+    python search.py "ronaldo 🔥" --platform Twitter
+"""
+
+import argparse
+import math
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+import corpus
+
+INDEX_PATH = os.path.join(".cache", "search_index.pkl")
+FORMAT_VERSION = 1
+
+SENTIMENTS = ["positive", "neutral", "negative", "unscored"]
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_NO_DATE = np.iinfo(np.int64).min
+
+
+class SearchIndex:
+    def __init__(self):
+        self.keys = []
+        self.key_ids = {}
+        self.texts = np.empty(0, dtype=object)
+        self.platforms = np.empty(0, dtype=np.int8)
+        self.sentiments = np.empty(0, dtype=np.int8)
+        self.dates = np.empty(0, dtype=np.int64)
+        self.doc_lengths = np.empty(0, dtype=np.int32)
+        # term -> (doc ids, term frequencies), both sorted by doc id
+        self.postings = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    # === Building ===
+    def add(self, df):
+        """Index the rows of a corpus frame whose key is not indexed yet.
+
+        Returns the number of documents added.
+        """
+        df = df[~df["key"].isin(self.key_ids)].drop_duplicates(subset="key")
+        if df.empty:
+            return 0
+
+        first_id = len(self.keys)
+        doc_ids = np.arange(first_id, first_id + len(df), dtype=np.int32)
+        tokens = [corpus.tokenize(text) for text in df["text"]]
+
+        sentiment = df["sentiment"] if "sentiment" in df else "unscored"
+        sentiment = pd.Series(sentiment, index=df.index)
+        # Days since the epoch; NaT is stored as int64 min (_NO_DATE).
+        dates = pd.to_datetime(df["date"]).to_numpy("datetime64[D]")
+
+        self.keys.extend(df["key"])
+        self.key_ids.update(zip(df["key"], doc_ids.tolist()))
+        self.texts = np.concatenate([self.texts, df["text"].to_numpy(dtype=object)])
+        self.platforms = np.concatenate(
+            [self.platforms, _codes(df["platform"], corpus.PLATFORMS)]
+        )
+        self.sentiments = np.concatenate(
+            [self.sentiments, _codes(sentiment, SENTIMENTS)]
+        )
+        self.dates = np.concatenate([self.dates, dates.astype(np.int64)])
+        self.doc_lengths = np.concatenate(
+            [self.doc_lengths, np.array([len(t) for t in tokens], dtype=np.int32)]
+        )
+
+        # (term, doc) pairs -> term frequencies, grouped by term
+        pairs = pd.DataFrame(
+            {
+                "term": [term for doc in tokens for term in doc],
+                "doc": np.repeat(doc_ids, [len(t) for t in tokens]),
+            }
+        )
+        if pairs.empty:
+            return len(df)
+        tf = pairs.groupby(["term", "doc"], sort=True).size()
+        terms = tf.index.get_level_values("term").to_numpy()
+        docs = tf.index.get_level_values("doc").to_numpy(dtype=np.int32)
+        freqs = tf.to_numpy(dtype=np.int32)
+        bounds = np.flatnonzero(terms[1:] != terms[:-1]) + 1
+        for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(terms)]):
+            term = terms[start]
+            new_docs, new_freqs = docs[start:end], freqs[start:end]
+            if term in self.postings:
+                old_docs, old_freqs = self.postings[term]
+                new_docs = np.concatenate([old_docs, new_docs])
+                new_freqs = np.concatenate([old_freqs, new_freqs])
+            self.postings[term] = (new_docs, new_freqs)
+        return len(df)
+
+    # === Querying ===
+    def search(
+        self,
+        query,
+        platforms=None,
+        start=None,
+        end=None,
+        sentiments=None,
+        limit=20,
+        require_all=False,
+    ):
+        """Return the ``limit`` best BM25 hits for ``query`` as a DataFrame.
+
+        ``platforms`` and ``sentiments`` are lists of allowed values and
+        ``start``/``end`` bound the date (inclusive); ``None`` means no filter.
+        With ``require_all`` every query term must occur in a hit.
+        """
+        terms = list(dict.fromkeys(corpus.tokenize(query)))
+        n_docs = len(self.keys)
+        if not terms or n_docs == 0:
+            return _empty_results()
+
+        avg_length = max(self.doc_lengths.mean(), 1.0)
+        scores = np.zeros(n_docs, dtype=np.float64)
+        matched = np.zeros(n_docs, dtype=np.int16)
+        for term in terms:
+            if term not in self.postings:
+                if require_all:
+                    return _empty_results()
+                continue
+            docs, freqs = self.postings[term]
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = K1 * (1 - B + B * self.doc_lengths[docs] / avg_length)
+            scores[docs] += idf * freqs * (K1 + 1) / (freqs + norm)
+            matched[docs] += 1
+
+        mask = matched >= (len(terms) if require_all else 1)
+        if platforms is not None:
+            mask &= np.isin(self.platforms, _codes(platforms, corpus.PLATFORMS))
+        if sentiments is not None:
+            mask &= np.isin(self.sentiments, _codes(sentiments, SENTIMENTS))
+        if start is not None:
+            mask &= self.dates >= _day(start)
+        if end is not None:
+            mask &= (self.dates <= _day(end)) & (self.dates != _NO_DATE)
+
+        hits = np.flatnonzero(mask)
+        if len(hits) > limit:
+            hits = hits[np.argpartition(-scores[hits], limit - 1)[:limit]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+
+        return pd.DataFrame(
+            {
+                "key": [self.keys[i] for i in hits],
+                "platform": np.array(corpus.PLATFORMS)[self.platforms[hits]],
+                "date": self.dates[hits].astype("datetime64[D]"),
+                "sentiment": np.array(SENTIMENTS)[self.sentiments[hits]],
+                "score": scores[hits].round(3),
+                "text": self.texts[hits],
+            }
+        )
+
+    # === Persistence ===
+    def save(self, path=INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                (FORMAT_VERSION, self.__dict__), f, protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        """Load a saved index; returns an empty one if missing or outdated."""
+        index = cls()
+        try:
+            with open(path, "rb") as f:
+                version, state = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return index
+        if version == FORMAT_VERSION:
+            index.__dict__.update(state)
+        return index
+
+
+def _codes(values, labels):
+    lookup = {label: code for code, label in enumerate(labels)}
+    return np.array([lookup.get(v, -1) for v in values], dtype=np.int8)
+
+
+def _day(value):
+    return pd.Timestamp(value).to_datetime64().astype("datetime64[D]").astype(np.int64)
+
+
+def _empty_results():
+    return pd.DataFrame(
+        columns=["key", "platform", "date", "sentiment", "score", "text"]
+    )
+
+
+def load_or_build(path=INDEX_PATH, sources=None):
+    """Load the persisted index and add any new corpus documents to it.
+
+    Only unseen documents are tokenized and sentiment-scored; the index is
+    written back to disk when something was added. The index holds exactly
+    the documents of ``sources``.
+    """
+    index = SearchIndex.load(path)
+    docs = corpus.load_corpus(sources)
+    if not set(index.key_ids) <= set(docs["key"]):
+        index = SearchIndex()  # documents were removed, e.g. by a rollback
+    new_docs = docs[~docs["key"].isin(index.key_ids)]
+    if not new_docs.empty:
+        index.add(corpus.add_sentiment(new_docs))
+        index.save(path)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("query")
+    parser.add_argument("--platform", action="append", choices=corpus.PLATFORMS)
+    parser.add_argument("--sentiment", action="append", choices=SENTIMENTS)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    index = load_or_build()
+    started = time.perf_counter()
+    hits = index.search(
+        args.query,
+        platforms=args.platform,
+        sentiments=args.sentiment,
+        limit=args.limit,
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    print(hits.to_string(index=False))
+    print(f"\n{len(index):,} documents indexed, query took {elapsed:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
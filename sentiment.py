@@ -0,0 +1,369 @@
+"""Text + emoji sentiment scoring shared by the dashboard and its tools.
+
+This is the scorer from the notebook's "Sentiment Analysis Function" cell:
+VADER's compound score for the text, blended 70/30 with a small emoji
+lexicon, then bucketed into positive / neutral / negative at +-0.05.
+
+Two backends produce that score:
+
+    vader     VADER's ``polarity_scores`` called once per text (the notebook)
+    lexicon   ``LexiconScorer``: the same lexicons applied to a whole column
+              through one sparse document-term matrix product, with VADER's
+              negation and booster rules approximated by token windows
+
+``python sentiment.py`` prints a calibration report of ``lexicon`` against
+``vader`` on the bundled corpora.
+"""
+
+import os
+import re
+import time
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+# Emoji sentiment dictionary (can be expanded)
+EMOJI_SENTIMENT = {
+    "😂": 0.8, "❤": 0.9, "🔥": 0.7, "👍": 0.7, "😍": 0.9,  # Positive
+    "😢": -0.7, "😡": -0.8, "👎": -0.7, "💩": -0.9,  # Negative
+    "🤔": 0.1, "😐": 0.0, "🙄": -0.3,  # Neutral
+}  # fmt: skip
+
+# Flags (pairs of regional indicators) first, then single pictographs.
+EMOJI_PATTERN = re.compile(
+    "[\U0001f1e6-\U0001f1ff]{2}|[\U0001f300-\U0001faff☀-➿⬀-⯿⌀-⏿]"
+)
+
+TEXT_WEIGHT = 0.7
+EMOJI_WEIGHT = 0.3
+THRESHOLD = 0.05
+
+BACKENDS = ["vader", "lexicon"]
+
+# VADER constants (see vaderSentiment.py)
+NEGATION_SCALAR = -0.74
+BOOSTER_INCREMENT = 0.293
+EXCLAMATION_INCREMENT = 0.292
+NORMALIZATION_ALPHA = 15
+NEGATION_WINDOW = 3
+BOOSTER_DAMPING = [1.0, 0.95, 0.9]  # by distance from the boosted word
+
+NEGATIONS = {
+    "aint", "arent", "cannot", "cant", "couldnt", "darent", "didnt", "doesnt",
+    "ain't", "aren't", "can't", "couldn't", "daren't", "didn't", "doesn't",
+    "dont", "hadnt", "hasnt", "havent", "isnt", "mightnt", "mustnt", "neither",
+    "don't", "hadn't", "hasn't", "haven't", "isn't", "mightn't", "mustn't",
+    "neednt", "needn't", "never", "none", "nope", "nor", "not", "nothing",
+    "nowhere", "oughtnt", "shant", "shouldnt", "uhuh", "wasnt", "werent",
+    "oughtn't", "shan't", "shouldn't", "wasn't", "weren't", "without", "wont",
+    "wouldnt", "won't", "wouldn't", "rarely", "seldom", "despite",
+}  # fmt: skip
+
+# Single-word boosters (+) and dampeners (-) from VADER's BOOSTER_DICT.
+BOOSTERS = dict.fromkeys(
+    "absolutely amazingly awfully completely considerable considerably "
+    "decidedly deeply effing enormous enormously entirely especially "
+    "exceptional exceptionally extreme extremely fabulously flipping flippin "
+    "frackin fracking fricking frickin frigging friggin fully fuckin fucking "
+    "fuggin fugging greatly hella highly hugely incredible incredibly "
+    "intensely major majorly more most particularly purely quite really "
+    "remarkably so substantially thoroughly total totally tremendous "
+    "tremendously uber unbelievably unusually utter utterly very".split(),
+    BOOSTER_INCREMENT,
+)
+BOOSTERS.update(
+    dict.fromkeys(
+        "almost barely hardly kinda kindof less little marginal marginally "
+        "occasional occasionally partly scarce scarcely slight slightly "
+        "somewhat sorta sortof".split(),
+        -BOOSTER_INCREMENT,
+    )
+)
+
+# Texts are joined with NUL before tokenizing so one regex pass covers the
+# whole column; the NUL tokens mark where each text ends.
+_TEXT_SEPARATOR = "\x00"
+LEXICON_TOKEN_PATTERN = re.compile(r"[\w']+|" + EMOJI_PATTERN.pattern + "|\x00")
+
+
+def extract_emojis(text):
+    """Extract all emojis from text"""
+    return EMOJI_PATTERN.findall(str(text))
+
+
+def emoji_sentiment_score(text):
+    """Calculate emoji sentiment score"""
+    emojis = extract_emojis(text)
+    if not emojis:
+        return 0
+    return float(np.mean([EMOJI_SENTIMENT.get(e, 0) for e in emojis]))
+
+
+def load_vader():
+    """Return a VADER analyzer, or None when no VADER install is available.
+
+    The notebook uses NLTK's copy; the standalone ``vaderSentiment`` package
+    ships the same lexicon and is tried second.
+    """
+    try:
+        from nltk.sentiment import SentimentIntensityAnalyzer
+
+        return SentimentIntensityAnalyzer()
+    except (ImportError, LookupError):
+        pass
+    try:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+        return SentimentIntensityAnalyzer()
+    except ImportError:
+        return None
+
+
+def label_scores(scores):
+    """Bucket combined scores into positive / neutral / negative labels."""
+    scores = np.asarray(scores, dtype=float)
+    return np.select(
+        [scores > THRESHOLD, scores < -THRESHOLD],
+        ["positive", "negative"],
+        default="neutral",
+    )
+
+
+def load_vader_lexicon():
+    """VADER's word -> valence lexicon, or None when VADER is not installed."""
+    lines = None
+    try:
+        import nltk
+
+        path = "sentiment/vader_lexicon.zip/vader_lexicon/vader_lexicon.txt"
+        lines = nltk.data.load(path, format="text").splitlines()
+    except (ImportError, LookupError):
+        pass
+    if lines is None:
+        try:
+            import vaderSentiment
+        except ImportError:
+            return None
+        path = os.path.join(
+            os.path.dirname(vaderSentiment.__file__), "vader_lexicon.txt"
+        )
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    lexicon = {}
+    for line in lines:
+        parts = line.strip().split("\t")
+        if len(parts) >= 2:
+            lexicon[parts[0]] = float(parts[1])
+    return lexicon
+
+
+class LexiconScorer:
+    """Vectorized VADER-style scorer for whole columns of text.
+
+    Every token of every text is mapped to a vocabulary id in one pass, the
+    negation and booster rules are evaluated on shifted copies of the token
+    array, and the resulting per-occurrence weights form a sparse
+    (texts x 2*vocab) matrix. One product with a (2*vocab x 2) weight matrix
+    then yields each text's summed word valence and summed emoji score.
+    """
+
+    def __init__(self, lexicon=None):
+        from scipy import sparse
+
+        self._sparse = sparse
+        lexicon = lexicon if lexicon is not None else load_vader_lexicon()
+        if lexicon is None:
+            raise ImportError(
+                "VADER lexicon not found (pip install nltk or vaderSentiment)"
+            )
+        words = list(
+            dict.fromkeys(chain(lexicon, EMOJI_SENTIMENT, NEGATIONS, BOOSTERS))
+        )
+        self.vocab = pd.Index(words)
+        self.lookup = {word: i for i, word in enumerate(words)}
+        self.lookup[_TEXT_SEPARATOR] = -2
+        size = len(words)
+
+        # One extra slot at the end so that unknown tokens (id -1) read zeros.
+        valence = np.zeros(size + 1)
+        valence[:size] = [lexicon.get(w, 0.0) for w in words]
+        emoji = np.zeros(size + 1)
+        emoji[:size] = [EMOJI_SENTIMENT.get(w, 0.0) for w in words]
+        self.valence = valence
+        padded = np.array(words + [""], dtype=object)
+        self.is_emoji = np.isin(padded, list(EMOJI_SENTIMENT))
+        self.is_negation = np.isin(padded, list(NEGATIONS))
+        self.boost = np.zeros(size + 1)
+        self.boost[:size] = [BOOSTERS.get(w, 0.0) for w in words]
+
+        # Columns [0, size) carry the occurrence weight, [size, 2*size) the
+        # booster amount, which moves a word's valence away from zero.
+        weights = np.zeros((2 * size, 2))
+        weights[:size, 0] = valence[:size]
+        weights[size:, 0] = np.sign(valence[:size])
+        weights[:size, 1] = emoji[:size]
+        self.weights = weights
+
+    def tokenize(self, texts):
+        """Lowercased texts plus (text index, vocabulary id) per token."""
+        texts = pd.Series(texts, dtype=object).fillna("").astype(str)
+        texts = texts.str.replace(_TEXT_SEPARATOR, " ", regex=False)
+        if texts.empty:
+            empty = np.empty(0, dtype=np.int64)
+            return texts, empty, empty
+        joined = _TEXT_SEPARATOR.join(texts.tolist()).lower()
+        tokens = LEXICON_TOKEN_PATTERN.findall(joined)
+        # Hash the tokens once, then look up only the distinct ones.
+        positions, distinct = pd.factorize(np.array(tokens, dtype=object))
+        lookup = self.lookup.get
+        codes = np.array([lookup(t, -1) for t in distinct], dtype=np.int64)
+        codes = codes[positions]
+        separators = codes == -2
+        doc = np.cumsum(separators)[~separators]
+        lowered = pd.Series(joined.split(_TEXT_SEPARATOR), index=texts.index)
+        return lowered, doc, codes[~separators]
+
+    def transform(self, texts):
+        """Sparse (texts x 2*vocab) matrix of weighted lexicon occurrences."""
+        lowered, doc, codes = self.tokenize(texts)
+        negations = np.zeros(len(codes))
+        boost = np.zeros(len(codes))
+        is_negation = self.is_negation[codes]
+        token_boost = self.boost[codes]
+        for distance in range(1, NEGATION_WINDOW + 1):
+            same_doc = doc[distance:] == doc[:-distance]
+            negations[distance:] += is_negation[:-distance] & same_doc
+            boost[distance:] += (
+                token_boost[:-distance] * same_doc * BOOSTER_DAMPING[distance - 1]
+            )
+
+        factor = np.where(self.is_emoji[codes], 1.0, NEGATION_SCALAR**negations)
+        scored = (self.valence[codes] != 0) | self.is_emoji[codes]
+        rows, cols = doc[scored], codes[scored]
+        data = np.r_[factor[scored], (factor * boost)[scored]]
+        size = len(self.vocab)
+        matrix = self._sparse.csr_matrix(
+            (data, (np.r_[rows, rows], np.r_[cols, cols + size])),
+            shape=(len(lowered), 2 * size),
+        )
+        return lowered, matrix
+
+    def score(self, texts):
+        """Combined text + emoji sentiment, as ``score_texts`` computes it."""
+        lowered, matrix = self.transform(texts)
+        sums = matrix @ self.weights
+        valence = sums[:, 0]
+        exclamations = lowered.str.count("!").clip(upper=4).to_numpy()
+        valence = valence + np.sign(valence) * exclamations * EXCLAMATION_INCREMENT
+        compound = valence / np.sqrt(valence * valence + NORMALIZATION_ALPHA)
+        emoji_counts = lowered.str.count(EMOJI_PATTERN.pattern).to_numpy()
+        emoji_mean = sums[:, 1] / np.maximum(emoji_counts, 1)
+        return TEXT_WEIGHT * compound + EMOJI_WEIGHT * emoji_mean
+
+
+_lexicon_scorer = None
+
+
+def get_lexicon_scorer():
+    """Shared ``LexiconScorer`` (building the vocabulary takes a moment)."""
+    global _lexicon_scorer
+    if _lexicon_scorer is None:
+        _lexicon_scorer = LexiconScorer()
+    return _lexicon_scorer
+
+
+def score_texts(texts, sia=None, backend="vader"):
+    """Combined text + emoji sentiment for an iterable of texts.
+
+    ``backend`` is one of ``BACKENDS``. Returns a float array, or None if
+    VADER is not installed.
+    """
+    if backend == "lexicon":
+        try:
+            return get_lexicon_scorer().score(texts)
+        except ImportError:
+            return None
+    sia = sia or load_vader()
+    if sia is None:
+        return None
+    texts = pd.Series(texts, dtype=object).fillna("").astype(str)
+    text_scores = texts.map(lambda x: sia.polarity_scores(x)["compound"])
+    emoji_scores = texts.map(emoji_sentiment_score)
+    return (TEXT_WEIGHT * text_scores + EMOJI_WEIGHT * emoji_scores).to_numpy()
+
+
+def calibration_report(sources=None):
+    """Compare the ``lexicon`` backend with ``vader`` on the bundled corpora.
+
+    One row per corpus source: Pearson correlation and mean absolute
+    difference of the combined scores, share of identical labels, and the
+    throughput of each backend in texts per second.
+    """
+    import corpus
+
+    sia = load_vader()
+    scorer = get_lexicon_scorer()
+    if sia is None:
+        raise ImportError("VADER is not installed (pip install nltk or vaderSentiment)")
+
+    rows = []
+    docs = corpus.load_corpus(sources)
+    for source, group in docs.groupby("source", sort=False):
+        started = time.perf_counter()
+        vader = score_texts(group["text"], sia=sia)
+        vader_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        lexicon = scorer.score(group["text"])
+        lexicon_seconds = time.perf_counter() - started
+        rows.append(
+            {
+                "Source": source,
+                "Texts": len(group),
+                "Correlation": np.corrcoef(vader, lexicon)[0, 1],
+                "Mean Abs Diff": np.abs(vader - lexicon).mean(),
+                "Label Agreement %": (
+                    label_scores(vader) == label_scores(lexicon)
+                ).mean()
+                * 100,
+                "VADER texts/s": len(group) / vader_seconds,
+                "Lexicon texts/s": len(group) / lexicon_seconds,
+            }
+        )
+    return pd.DataFrame(rows).round(3)
+
+
+def benchmark(texts, repeat=20):
+    """Texts per second of the ``lexicon`` backend on ``texts`` tiled ``repeat`` times."""
+    scorer = get_lexicon_scorer()
+    texts = pd.concat([pd.Series(texts, dtype=object)] * repeat, ignore_index=True)
+    started = time.perf_counter()
+    scorer.score(texts)
+    return len(texts), len(texts) / (time.perf_counter() - started)
+
+
+def main():
+    import corpus
+
+    pd.set_option("display.width", 160)
+    print(calibration_report().to_string(index=False))
+    count, rate = benchmark(corpus.load_corpus()["text"])
+    print(f"\nBulk lexicon scoring: {count:,} texts at {rate:,.0f} texts/s")
+
+
+def analyze_sentiment_with_emoji(df, text_column, backend="vader"):
+    """
+    Perform combined text + emoji sentiment analysis
+    Returns DataFrame with added sentiment columns
+    """
+    df = df.copy()
+    scores = score_texts(df[text_column], backend=backend)
+    if scores is None:
+        raise ImportError("VADER is not installed (pip install nltk or vaderSentiment)")
+    df["combined_sentiment"] = scores
+    df["sentiment"] = label_scores(scores)
+    return df
+
+
+if __name__ == "__main__":
+    main()
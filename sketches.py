@@ -0,0 +1,371 @@
+"""Fixed-memory, mergeable sketches for audience and token counts.
+
+- ``HyperLogLog`` estimates how many distinct values (comment authors,
+  follower handles) were seen, in ``2 ** precision`` bytes.
+- ``CountMinSketch`` estimates how often any one value was seen. It never
+  underestimates.
+- ``SpaceSaving`` keeps the ``capacity`` most frequent values and their
+  counts, with a bound on each count's overestimate.
+
+All three only grow with their parameters, never with the number of
+distinct values, and ``merge`` combines sketches of disjoint chunks into the
+sketch of their union. ``CorpusSketches`` uses them for distinct authors per
+creator / platform / day and for the heaviest emoji, hashtags, mentions and
+keywords per creator / platform. Each input file is sketched in chunks by a
+separate process and the results are merged. Per-file sketches are pickled
+to ``.cache/sketches.pkl`` and only files whose ``datastore.table_version``
+changed are read again.
+
+    python sketches.py --kind hashtag --top 10
+"""
+
+import argparse
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+import cachefile
+import corpus
+import datastore
+from creators import CREATORS, input_file
+from sentiment import EMOJI_PATTERN
+
+CACHE_PATH = os.path.join(".cache", "sketches.pkl")
+FORMAT_VERSION = 1
+
+KINDS = ["emoji", "hashtag", "mention", "keyword"]
+
+# Words too common to be interesting as keywords
+STOPWORDS = frozenset(
+    "the and you for that this with are was but not his have just he him she "
+    "her they them what your all from out get got like can its it's dont don't "
+    "i'm im one when who how why will would there their about more been has "
+    "had our was were she's he's bro lol yes yeah any some too very also than "
+    "then only into over here http https www com".split()
+)  # fmt: skip
+
+
+def _hash(values, seed=0):
+    """64-bit hashes of ``values`` as strings, stable across processes."""
+    values = np.asarray(values, dtype=object).astype(str).astype(object)
+    return pd.util.hash_array(values, hash_key=f"sketch{seed:010d}", categorize=False)
+
+
+class HyperLogLog:
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values):
+        hashes = _hash(values)
+        if len(hashes) == 0:
+            return
+        bits = 64 - self.precision
+        index = (hashes >> np.uint64(bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << bits) - 1)
+        # rank = position of the leftmost 1 bit in the remaining ``bits`` bits
+        rank = np.full(len(rest), bits + 1, dtype=np.uint8)
+        nonzero = rest > 0
+        rank[nonzero] = bits - np.floor(np.log2(rest[nonzero].astype(np.float64)))
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("cannot merge HyperLogLogs of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)  # linear counting for small sets
+        return int(round(estimate))
+
+
+class CountMinSketch:
+    def __init__(self, width=2048, depth=4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _columns(self, values):
+        return [
+            _hash(values, seed=row) % np.uint64(self.width) for row in range(self.depth)
+        ]
+
+    def add(self, values, counts=None):
+        counts = np.ones(len(values), dtype=np.int64) if counts is None else counts
+        for row, columns in enumerate(self._columns(values)):
+            np.add.at(self.table[row], columns.astype(np.intp), counts)
+
+    def merge(self, other):
+        if other.table.shape != self.table.shape:
+            raise ValueError("cannot merge Count-Min sketches of different shape")
+        self.table += other.table
+        return self
+
+    def estimate(self, values):
+        rows = [
+            self.table[row, columns.astype(np.intp)]
+            for row, columns in enumerate(self._columns(values))
+        ]
+        return np.min(rows, axis=0)
+
+
+class SpaceSaving:
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.counts = {}  # value -> count (an overestimate by at most its error)
+        self.errors = {}
+
+    def __len__(self):
+        return len(self.counts)
+
+    def _floor(self):
+        """The count every unmonitored value is bounded by."""
+        return min(self.counts.values()) if len(self) >= self.capacity else 0
+
+    def add(self, values, counts=None):
+        """Count ``values`` (with ``counts``, as ``value_counts`` gives)."""
+        counts = np.ones(len(values), dtype=np.int64) if counts is None else counts
+        batch = pd.Series(counts, index=pd.Index(values, dtype=object))
+        batch = batch.groupby(level=0, sort=False).sum()
+        exact = SpaceSaving(capacity=len(batch) + 1)
+        exact.counts = dict(zip(batch.index, batch.tolist()))
+        exact.errors = dict.fromkeys(exact.counts, 0)
+        self.merge(exact)
+
+    def merge(self, other):
+        """Mergeable summaries merge: add both counts, keep the largest."""
+        floor, other_floor = self._floor(), other._floor()
+        counts, errors = {}, {}
+        for value in self.counts.keys() | other.counts.keys():
+            counts[value] = self.counts.get(value, floor) + other.counts.get(
+                value, other_floor
+            )
+            errors[value] = self.errors.get(value, floor) + other.errors.get(
+                value, other_floor
+            )
+        kept = sorted(counts, key=counts.get, reverse=True)[: self.capacity]
+        self.counts = {value: counts[value] for value in kept}
+        self.errors = {value: errors[value] for value in kept}
+        return self
+
+    def top(self, n):
+        """The ``n`` largest (value, count, error) triples."""
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return [(value, count, self.errors[value]) for value, count in ranked[:n]]
+
+
+class HeavyHitters:
+    """Space-Saving candidates, their counts tightened by a Count-Min sketch."""
+
+    def __init__(self, capacity=256, width=2048, depth=4):
+        self.candidates = SpaceSaving(capacity)
+        self.frequencies = CountMinSketch(width, depth)
+        self.total = 0
+
+    def add(self, values, counts=None):
+        self.candidates.add(values, counts)
+        self.frequencies.add(values, counts)
+        self.total += len(values) if counts is None else int(np.sum(counts))
+
+    def merge(self, other):
+        self.candidates.merge(other.candidates)
+        self.frequencies.merge(other.frequencies)
+        self.total += other.total
+        return self
+
+    def top(self, n=10):
+        candidates = self.candidates.top(max(n * 2, n + 10))
+        if not candidates:
+            return pd.DataFrame(columns=["Token", "Count"])
+        values = [value for value, _, _ in candidates]
+        counts = np.minimum(
+            [count for _, count, _ in candidates], self.frequencies.estimate(values)
+        )
+        df = pd.DataFrame({"Token": values, "Count": counts})
+        return df.sort_values("Count", ascending=False, kind="stable").head(n)
+
+
+def token_kind(token):
+    if token[0] == "#":
+        return "hashtag"
+    if token[0] == "@":
+        return "mention"
+    if EMOJI_PATTERN.fullmatch(token):
+        return "emoji"
+    if len(token) > 2 and not token.isdigit() and token not in STOPWORDS:
+        return "keyword"
+    return None
+
+
+class CorpusSketches:
+    def __init__(self, precision=12, capacity=256):
+        self.precision = precision
+        self.capacity = capacity
+        self.authors = {}  # (creator, platform, day) -> HyperLogLog
+        self.followers = {}  # creator -> HyperLogLog
+        self.tokens = {}  # (creator, platform, kind) -> HeavyHitters
+
+    def _hll(self, sketches, key):
+        if key not in sketches:
+            sketches[key] = HyperLogLog(self.precision)
+        return sketches[key]
+
+    def add(self, creator, df):
+        """Sketch a unified corpus frame (with an ``author`` column)."""
+        for platform, rows in df.groupby("platform"):
+            authored = rows.dropna(subset=["author"])
+            days = authored["date"].dt.normalize()
+            for day, authors in authored["author"].groupby(days):
+                self._hll(self.authors, (creator, platform, day)).add(authors)
+
+            tokens = pd.Series(
+                [token for text in rows["text"] for token in corpus.tokenize(text)],
+                dtype=object,
+            )
+            kinds = tokens.map(token_kind)
+            for kind, counts in tokens.groupby(kinds).value_counts().groupby(level=0):
+                key = (creator, platform, kind)
+                if key not in self.tokens:
+                    self.tokens[key] = HeavyHitters(self.capacity)
+                values = counts.index.get_level_values(1)
+                self.tokens[key].add(values, counts.to_numpy())
+
+    def add_followers(self, creator, handles):
+        self._hll(self.followers, creator).add(handles)
+
+    def merge(self, other):
+        for mine, theirs in [
+            (self.authors, other.authors),
+            (self.followers, other.followers),
+            (self.tokens, other.tokens),
+        ]:
+            for key, sketch in theirs.items():
+                if key in mine:
+                    mine[key].merge(sketch)
+                else:
+                    mine[key] = pickle.loads(pickle.dumps(sketch))
+        return self
+
+    def distinct_authors(self, by=("creator", "platform")):
+        """Estimated distinct authors per group of ``by`` (creator/platform/day)."""
+        fields = ["creator", "platform", "day"]
+        groups = {}
+        for key, sketch in self.authors.items():
+            group = tuple(key[fields.index(field)] for field in by)
+            if group not in groups:
+                groups[group] = HyperLogLog(self.precision)
+            groups[group].merge(sketch)
+        rows = [(*group, sketch.count()) for group, sketch in groups.items()]
+        df = pd.DataFrame(rows, columns=[*by, "Distinct Authors"])
+        return df.sort_values(list(by)).reset_index(drop=True)
+
+    def distinct_followers(self):
+        return pd.DataFrame(
+            [(creator, hll.count()) for creator, hll in self.followers.items()],
+            columns=["creator", "Distinct Followers"],
+        )
+
+    def heavy_hitters(self, kind, n=10, creator=None, platform=None):
+        """Top ``n`` tokens of ``kind``, per creator and platform."""
+        frames = []
+        for (c, p, k), sketch in sorted(self.tokens.items()):
+            if k != kind or creator not in (None, c) or platform not in (None, p):
+                continue
+            frames.append(sketch.top(n).assign(creator=c, platform=p))
+        if not frames:
+            return pd.DataFrame(columns=["creator", "platform", "Token", "Count"])
+        df = pd.concat(frames, ignore_index=True)
+        return df[["creator", "platform", "Token", "Count"]]
+
+
+def _inputs(creators=None):
+    """(creator, source, path) of every input file sketches are built from."""
+    inputs = []
+    for creator in creators or CREATORS:
+        for source in [*corpus.SOURCES, "followers"]:
+            path = input_file(creator, source)
+            if datastore.exists(path):
+                inputs.append((creator, source, path))
+    return inputs
+
+
+def input_files(creators=None):
+    return [path for _, _, path in _inputs(creators)]
+
+
+def sketch_file(creator, source, path, chunksize=10_000):
+    """Sketches of one input file, read ``chunksize`` rows at a time."""
+    sketches = CorpusSketches()
+    if source == "followers":
+        for chunk in datastore.read_csv_chunks(path, chunksize):
+            sketches.add_followers(creator, chunk["screen_name"].dropna())
+        return sketches
+    for chunk in corpus.read_source_chunks(source, path, chunksize, authors=True):
+        sketches.add(creator, chunk)
+    return sketches
+
+
+def _sketch_task(task, manifest):
+    # Workers read the same snapshot as the caller
+    datastore.pin_snapshot(manifest)
+    return task, sketch_file(*task)
+
+
+def load_or_build(creators=None, path=CACHE_PATH, workers=None):
+    """Merged sketches of every input, re-sketching only files that changed.
+
+    Changed files are sketched by ``workers`` processes (in this process
+    when ``workers`` is 1).
+    """
+    state = cachefile.load(path, FORMAT_VERSION)
+    parts = state["parts"] if state else {}
+
+    inputs = _inputs(creators)
+    current = {task: datastore.table_version(task[2]) for task in inputs}
+    stale = [task for task in inputs if parts.get(task, (None,))[0] != current[task]]
+    if stale:
+        if workers == 1 or len(stale) == 1:
+            results = [(task, sketch_file(*task)) for task in stale]
+        else:
+            manifests = repeat(datastore.pinned_snapshot())
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_sketch_task, stale, manifests))
+        for task, sketches in results:
+            parts[task] = (current[task], sketches)
+        parts = {task: parts[task] for task in inputs}
+        cachefile.dump(path, FORMAT_VERSION, parts=parts)
+
+    merged = CorpusSketches()
+    for task in inputs:
+        merged.merge(parts[task][1])
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kind", choices=KINDS, default="emoji")
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    sketches = load_or_build(workers=args.workers)
+    print(f"Sketched in {time.perf_counter() - started:.2f}s\n")
+    print(sketches.distinct_authors().to_string(index=False))
+    print(sketches.distinct_followers().to_string(index=False), "\n")
+    print(sketches.heavy_hitters(args.kind, args.top).to_string(index=False))
+
+
+if __name__ == "__main__":
+    cachefile.run_main("sketches")
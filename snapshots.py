@@ -0,0 +1,221 @@
+"""Versioned, content-addressed snapshots of the dashboard's CSV inputs.
+
+A refresh that overwrites the loose CSVs while viewers are on the page can
+show them a mix of old and new files. Instead, ``create`` packages every
+input into one snapshot:
+
+    .snapshots/tables/<sha256>.parquet   one file per distinct CSV content
+    .snapshots/manifests/<version>.json  table name -> hash, rows, columns
+    .snapshots/CURRENT                   the published version
+
+A table is named by the SHA-256 of its CSV bytes, so a CSV that did not
+change between snapshots is stored once and keeps its hash. Publishing
+writes the manifest first and then replaces ``CURRENT`` with
+``os.replace``, so readers see either the old snapshot or the new one,
+never a mix. ``datastore`` pins one manifest per script run and caches
+frames by table hash, so unchanged tables stay cached across a swap.
+Besides the dashboard's CSVs, a snapshot holds the raw per-creator inputs
+that the search index, sketches, rollups and other derived caches are
+built from, and those caches are keyed on the table hashes they read.
+
+    python snapshots.py                  # snapshot and publish the CSVs
+    python snapshots.py --list
+    python snapshots.py --publish 20250602T101500-1a2b3c4d
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import time
+
+import pandas as pd
+
+ROOT = ".snapshots"
+FORMAT_VERSION = 1
+KEEP = 5  # snapshots kept by ``prune``
+
+
+def _tables_dir(root):
+    return os.path.join(root, "tables")
+
+
+def _manifests_dir(root):
+    return os.path.join(root, "manifests")
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def default_files():
+    """The dashboard's CSVs, the raw per-creator inputs the derived caches
+    are built from, and every pipeline output on disk."""
+    import datastore
+    import growth
+    import pipeline
+    from creators import CREATORS, INPUT_SUFFIXES, input_file, output_file
+
+    inputs = [
+        input_file(creator, kind)
+        for creator in CREATORS
+        for kind in ["growth", *INPUT_SUFFIXES]
+    ]
+    outputs = [
+        output_file(creator, name)
+        for creator in CREATORS
+        for name in pipeline.OUTPUT_NAMES
+    ]
+    files = [
+        *datastore.DASHBOARD_FILES,
+        growth.NORMALIZED_INDEX_FILE,
+        *inputs,
+        *outputs,
+    ]
+    return [p for p in dict.fromkeys(files) if os.path.exists(p)]
+
+
+def table_path(digest, root=ROOT):
+    return os.path.join(_tables_dir(root), f"{digest}.parquet")
+
+
+def _add_table(path, root):
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    target = table_path(digest, root)
+    df = pd.read_csv(io.BytesIO(data))
+    if not os.path.exists(target):
+        tmp = f"{target}.tmp{os.getpid()}"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, target)
+    return {"hash": digest, "rows": len(df), "columns": list(df.columns)}
+
+
+def create(files=None, root=ROOT, publish_now=True):
+    """Snapshot ``files`` (``default_files()`` by default); returns the manifest."""
+    os.makedirs(_tables_dir(root), exist_ok=True)
+    os.makedirs(_manifests_dir(root), exist_ok=True)
+    tables = {path: _add_table(path, root) for path in files or default_files()}
+    combined = hashlib.sha256(
+        json.dumps({p: t["hash"] for p, t in sorted(tables.items())}).encode()
+    ).hexdigest()
+    manifest = {
+        "format": FORMAT_VERSION,
+        "version": f"{time.strftime('%Y%m%dT%H%M%S')}-{combined[:8]}",
+        "created": time.time(),
+        "tables": tables,
+    }
+    path = os.path.join(_manifests_dir(root), f"{manifest['version']}.json")
+    _write_atomic(path, json.dumps(manifest, indent=1).encode())
+    if publish_now:
+        publish(manifest["version"], root)
+    return manifest
+
+
+def publish(version, root=ROOT):
+    """Make ``version`` the snapshot readers load (an atomic swap)."""
+    if not os.path.exists(os.path.join(_manifests_dir(root), f"{version}.json")):
+        raise FileNotFoundError(f"no snapshot {version}")
+    _write_atomic(os.path.join(root, "CURRENT"), version.encode())
+
+
+def load_manifest(version, root=ROOT):
+    with open(os.path.join(_manifests_dir(root), f"{version}.json")) as f:
+        return json.load(f)
+
+
+_current = (None, None)  # (CURRENT's mtime and size, manifest)
+
+
+def current(root=ROOT):
+    """The published manifest, or None if nothing was ever published."""
+    global _current
+    pointer = os.path.join(root, "CURRENT")
+    try:
+        stat = os.stat(pointer)
+    except FileNotFoundError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    if _current[0] != stamp:
+        with open(pointer) as f:
+            _current = (stamp, load_manifest(f.read().strip(), root))
+    return _current[1]
+
+
+def read_table(digest, root=ROOT):
+    return pd.read_parquet(table_path(digest, root))
+
+
+def versions(root=ROOT):
+    """Snapshot versions, oldest first."""
+    try:
+        names = os.listdir(_manifests_dir(root))
+    except FileNotFoundError:
+        return []
+    return sorted(name[: -len(".json")] for name in names if name.endswith(".json"))
+
+
+def prune(keep=KEEP, root=ROOT):
+    """Delete all but the newest ``keep`` snapshots (never the published one)
+    and the tables no remaining snapshot uses."""
+    published = current(root)
+    kept = set(versions(root)[-keep:])
+    if published is not None:
+        kept.add(published["version"])
+    for version in set(versions(root)) - kept:
+        os.remove(os.path.join(_manifests_dir(root), f"{version}.json"))
+    used = {
+        table["hash"]
+        for version in kept
+        for table in load_manifest(version, root)["tables"].values()
+    }
+    for name in os.listdir(_tables_dir(root)):
+        if name.endswith(".parquet") and name[: -len(".parquet")] not in used:
+            os.remove(os.path.join(_tables_dir(root), name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--list", action="store_true", help="list snapshots")
+    group.add_argument("--publish", metavar="VERSION", help="roll to a snapshot")
+    parser.add_argument("--keep", type=int, default=KEEP)
+    args = parser.parse_args()
+
+    if args.list:
+        published = current()
+        for version in versions():
+            mark = "*" if published and published["version"] == version else " "
+            tables = load_manifest(version)["tables"]
+            print(f"{mark} {version}  {len(tables)} tables")
+        return
+    if args.publish:
+        publish(args.publish)
+        print(f"Published {args.publish}")
+        return
+
+    started = time.perf_counter()
+    previous = current()
+    manifest = create()
+    changed = [
+        path
+        for path, table in manifest["tables"].items()
+        if previous is None
+        or previous["tables"].get(path, {}).get("hash") != table["hash"]
+    ]
+    prune(args.keep)
+    print(
+        f"Published {manifest['version']}: {len(manifest['tables'])} tables,"
+        f" {len(changed)} changed, in {time.perf_counter() - started:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
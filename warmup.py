@@ -0,0 +1,118 @@
+"""Pre-warm the dashboard's imports and caches, and time how long that takes.
+
+Run it once after a deploy, before the server takes traffic, so that the
+on-disk caches (search index, growth rollups, comment stores, sketches,
+co-mention graph, sentiment change points) exist:
+
+    python warmup.py && python -m streamlit run app.py
+
+That only fills the on-disk caches; the in-process caches in ``datastore``
+belong to the server process. ``app.py`` calls ``start()`` on its first run,
+which runs the same steps on a background thread while the page renders.
+A section that needs a cache the thread is still building waits for that
+build (see ``datastore._built_from``) rather than building it again. With
+the on-disk caches in place this takes a few seconds, most of it scoring
+the sentiment summary. Figures are not pre-rendered. A failed step is
+logged with its traceback and the rest still run.
+"""
+
+import importlib
+import logging
+import threading
+import time
+
+import datastore
+
+# Heavy modules the dashboard imports per section
+HEAVY_IMPORTS = [
+    "numpy",
+    "plotly.graph_objects",
+    "plotly.express",
+    "plotly.colors",
+    "altair",
+]
+
+logger = logging.getLogger(__name__)
+
+_report = []
+_thread = None
+
+
+def _timed(step, func, *args):
+    started = time.perf_counter()
+    try:
+        func(*args)
+        status = "ok"
+    except Exception as e:  # a failed step must not stop the rest
+        logger.exception("warm-up step %r failed", step)
+        status = f"failed: {e!r}"
+    _report.append(
+        {
+            "Step": step,
+            "Seconds": round(time.perf_counter() - started, 3),
+            "Status": status,
+        }
+    )
+
+
+def warm_up():
+    """Import heavy modules and populate every cache in ``datastore``.
+
+    Returns the timing report, one dict per step.
+    """
+    import comment_store
+    import growth
+    import rollups
+
+    for module in HEAVY_IMPORTS:
+        _timed(f"import {module}", importlib.import_module, module)
+    for path in datastore.DASHBOARD_FILES:
+        _timed(f"read {path}", datastore.read_csv, path)
+    for metric in growth.METRICS:
+        _timed(
+            f"growth matrix ({metric})",
+            growth.growth_matrix,
+            tuple(growth.CREATORS),
+            metric,
+        )
+    for creator in rollups.available_creators():
+        _timed(f"growth rollups ({creator})", datastore.growth_pyramid, creator)
+    for creator in comment_store.available_creators():
+        _timed(f"comment store ({creator})", datastore.comment_store, creator)
+    _timed("search index", datastore.search_index)
+    _timed("corpus sketches", datastore.corpus_sketches)
+    _timed("co-mention graph", datastore.comention_graph)
+    _timed("forecast backtest", datastore.forecast_backtest)
+    _timed("sentiment events", datastore.sentiment_events)
+    _timed("sentiment summary", datastore.sentiment_summary)
+    return report()
+
+
+def start():
+    """Run ``warm_up`` on a daemon thread (once per process)."""
+    global _thread
+    if _thread is None:
+        _thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+        _thread.start()
+    return _thread
+
+
+def report():
+    return list(_report)
+
+
+def is_done():
+    return _thread is not None and not _thread.is_alive()
+
+
+def main():
+    started = time.perf_counter()
+    steps = warm_up()
+    width = max(len(step["Step"]) for step in steps)
+    for step in steps:
+        print(f"{step['Step']:<{width}}  {step['Seconds']:>7.3f}s  {step['Status']}")
+    print(f"\nWarm-up finished in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()